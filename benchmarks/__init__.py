@@ -0,0 +1,4 @@
+"""Benchmarks for model generation and the model endpoints.
+
+Run with `python -m benchmarks` from the repository root.
+"""
@@ -0,0 +1,103 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Annotated
+
+import structlog
+import typer
+
+app = typer.Typer()
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@app.command()
+def run(
+    output: Annotated[
+        Path | None, typer.Option(help="Write results here instead of stdout.")
+    ] = None,
+    fixture: Annotated[
+        list[str] | None, typer.Option(help="Only run these fixtures.")
+    ] = None,
+    engine: Annotated[
+        list[str] | None, typer.Option(help="Only run these engines.")
+    ] = None,
+    repeats: Annotated[int, typer.Option(help="Runs per case.", min=2)] = 3,
+    generation: Annotated[
+        bool, typer.Option(help="Benchmark model generation directly.")
+    ] = True,
+    endpoints: Annotated[
+        bool, typer.Option(help="Benchmark the model endpoint end to end.")
+    ] = True,
+) -> None:
+    """Run the benchmarks, emitting the results as JSON."""
+    work_dir = tempfile.mkdtemp(prefix="skyline-benchmark-")
+
+    # Configure Skyline before it's imported, so the benchmarks never touch a real
+    # database or model cache. Spawned worker processes inherit these.
+    db_path = Path(work_dir) / "skyline.sqlite"
+    os.environ["SKYLINE_DB_PATH"] = str(db_path)
+    # Set too, so a database URL configured in .env can't take precedence
+    os.environ["SKYLINE_DB_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["SKYLINE_MODEL_CACHE_DIR"] = str(Path(work_dir) / "model_cache")
+    # Nothing is requested from the frontend, so it doesn't need to be built first
+    frontend_dir = Path(work_dir) / "frontend"
+    frontend_dir.mkdir()
+    os.environ["SKYLINE_FRONTEND_DIR"] = str(frontend_dir)
+    for setting in (
+        "SKYLINE_GITHUB_CLIENT_ID",
+        "SKYLINE_GITHUB_CLIENT_SECRET",
+        "SKYLINE_GITHUB_MACHINE_USER_PAT",
+    ):
+        os.environ.setdefault(setting, "benchmark")
+
+    # Keep stdout for the results
+    structlog.configure(logger_factory=structlog.PrintLoggerFactory(sys.stderr))
+
+    from skyline.schemas.contributions import ModelEngine
+
+    from .endpoints import benchmark_endpoints
+    from .fixtures import days_fixtures
+    from .generation import benchmark_generation
+
+    fixtures = [f for f in days_fixtures() if not fixture or f.name in fixture]
+    engines = [e for e in ModelEngine if not engine or e.value in engine]
+
+    results = {
+        "metadata": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "commit": _commit(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeats": repeats,
+        },
+        "generation": (
+            benchmark_generation(fixtures, engines, repeats) if generation else []
+        ),
+        "endpoints": (
+            benchmark_endpoints(fixtures, engines, repeats) if endpoints else []
+        ),
+    }
+
+    serialized = json.dumps(results, indent=2)
+    if output is None:
+        typer.echo(serialized)
+    else:
+        output.write_text(serialized)
+
+
+if __name__ == "__main__":
+    app()
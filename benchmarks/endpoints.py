@@ -0,0 +1,117 @@
+import asyncio
+import time
+from datetime import date
+from typing import Any, Callable
+
+import alembic.config
+from fastapi.testclient import TestClient
+
+from skyline.app import app
+from skyline.cad.pool import model_pool
+from skyline.db import async_session
+from skyline.dependencies.auth import require_user
+from skyline.models.contribution_data import (
+    ContributionData,
+    ContributionImporter,
+    pack_counts,
+)
+from skyline.schemas.contributions import ModelEngine
+
+from .fixtures import DaysFixture
+
+
+def _user(fixture: DaysFixture) -> str:
+    return f"benchmark-{fixture.name}"
+
+
+async def _seed(fixtures: list[DaysFixture]) -> None:
+    async with async_session() as session, session.begin():
+        for fixture in fixtures:
+            for importer in ContributionImporter:
+                session.add(
+                    ContributionData(
+                        user=_user(fixture),
+                        year=fixture.year,
+                        importer=importer,
+                        start_weekday=fixture.start_weekday,
+                        counts=pack_counts(fixture.counts),
+                        imported_through=date(fixture.year, 12, 31),
+                    )
+                )
+
+
+def _override_user(user: str) -> Callable[[], str]:
+    return lambda: user
+
+
+def _timed_get(client: TestClient, url: str, accept_encoding: str) -> dict[str, Any]:
+    start = time.perf_counter()
+    with client.stream(
+        "GET", url, headers={"Accept-Encoding": accept_encoding}
+    ) as response:
+        # Count the bytes as sent, before the client decompresses them
+        body_bytes = sum(len(chunk) for chunk in response.iter_raw())
+
+    seconds = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {url} responded with {response.status_code}")
+
+    return {
+        "status_code": response.status_code,
+        "content_encoding": response.headers.get("Content-Encoding"),
+        "seconds": seconds,
+        "bytes": body_bytes,
+    }
+
+
+def benchmark_endpoints(
+    fixtures: list[DaysFixture], engines: list[ModelEngine], repeats: int
+) -> list[dict[str, Any]]:
+    """Time `get_model` end to end against a freshly migrated and seeded database.
+
+    The first request for each model is a cache miss and goes through the model
+    generation pool, restarted beforehand so no geometry is cached in its workers.
+    Later requests are served from the model cache.
+    """
+    alembic.config.main(argv=["--raiseerr", "upgrade", "head"])
+    asyncio.run(_seed(fixtures))
+
+    results = []
+    with TestClient(app) as client:
+        for fixture in fixtures:
+            app.dependency_overrides[require_user] = _override_user(_user(fixture))
+
+            for engine in engines:
+                for labelled in (False, True):
+                    if labelled and engine == ModelEngine.Mesh:
+                        continue
+
+                    url = (
+                        f"/contributions/model/{fixture.year}"
+                        f"?engine={engine.value}&include_labels={str(labelled).lower()}"
+                    )
+                    model_pool.restart()
+                    cold = _timed_get(client, url, "identity")
+                    warm = {
+                        encoding: [
+                            _timed_get(client, url, encoding) for _ in range(repeats)
+                        ]
+                        for encoding in ("identity", "gzip", "br")
+                    }
+
+                    results.append(
+                        {
+                            "fixture": fixture.name,
+                            "year": fixture.year,
+                            "engine": engine.value,
+                            "labelled": labelled,
+                            "cold": cold,
+                            "warm": warm,
+                        }
+                    )
+
+    app.dependency_overrides.pop(require_user, None)
+    return results
+
+
+__all__ = ["benchmark_endpoints"]
@@ -0,0 +1,78 @@
+import calendar
+import random
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class DaysFixture:
+    """A synthetic year of contribution counts."""
+
+    name: str
+    year: int
+    counts: tuple[int, ...]
+
+    @property
+    def start_weekday(self) -> int:
+        # Sunday is 0, matching how contributions are stored
+        return date(self.year, 1, 1).isoweekday() % 7
+
+    @property
+    def days(self) -> list[int | None]:
+        """The counts padded to start on a Sunday, as passed to model generation."""
+        return [None] * self.start_weekday + list(self.counts)
+
+
+def _year_starting_on(weekday: int) -> int:
+    return next(
+        year
+        for year in range(2010, 2100)
+        if date(year, 1, 1).isoweekday() % 7 == weekday and not calendar.isleap(year)
+    )
+
+
+def _counts(
+    year: int, seed: int, count: Callable[[random.Random], int]
+) -> tuple[int, ...]:
+    rng = random.Random(seed)
+    return tuple(count(rng) for _ in range(366 if calendar.isleap(year) else 365))
+
+
+def _sparse(rng: random.Random) -> int:
+    return rng.randint(1, 3) if rng.random() < 0.15 else 0
+
+
+def _dense(rng: random.Random) -> int:
+    return rng.randint(1, 15)
+
+
+def _moderate(rng: random.Random) -> int:
+    return rng.choice((0, 0, 1, 1, 2, 3, 5, 8))
+
+
+def _outliers(rng: random.Random) -> int:
+    return rng.randint(250, 500) if rng.random() < 0.02 else _sparse(rng)
+
+
+def days_fixtures() -> list[DaysFixture]:
+    fixtures = [
+        DaysFixture("empty", 2023, _counts(2023, 0, lambda _: 0)),
+        DaysFixture("sparse", 2023, _counts(2023, 1, _sparse)),
+        DaysFixture("dense", 2023, _counts(2023, 2, _dense)),
+        DaysFixture("outliers", 2023, _counts(2023, 3, _outliers)),
+        DaysFixture("leap", 2024, _counts(2024, 4, _moderate)),
+    ]
+
+    for weekday, name in enumerate(
+        ("sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday")
+    ):
+        year = _year_starting_on(weekday)
+        fixtures.append(
+            DaysFixture(f"starts-{name}", year, _counts(year, 10 + weekday, _moderate))
+        )
+
+    return fixtures
+
+
+__all__ = ["DaysFixture", "days_fixtures"]
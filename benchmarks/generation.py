@@ -0,0 +1,98 @@
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from skyline.cad.generation import generate_model
+from skyline.cad.skyline import prebuild_text
+from skyline.schemas.contributions import ModelEngine, ModelFormat
+
+from .fixtures import DaysFixture
+
+
+def _max_rss_bytes() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS reports bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _run_case(
+    engine: ModelEngine,
+    days: list[int | None],
+    label: str | None,
+    include_month_label: bool,
+    repeats: int,
+) -> dict[str, Any]:
+    # Prepare the process the same way model generation workers are
+    prebuild_text()
+    baseline_rss = _max_rss_bytes()
+
+    durations: list[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model = generate_model(
+            engine=engine,
+            days=days,
+            label=label,
+            include_month_label=include_month_label,
+            model_format=ModelFormat.STL,
+        )
+        durations.append(time.perf_counter() - start)
+
+    return {
+        "cold_seconds": durations[0],
+        "warm_seconds": durations[1:],
+        "output_bytes": len(model),
+        "baseline_rss_bytes": baseline_rss,
+        "peak_rss_bytes": _max_rss_bytes(),
+    }
+
+
+def benchmark_generation(
+    fixtures: list[DaysFixture], engines: list[ModelEngine], repeats: int
+) -> list[dict[str, Any]]:
+    """Time model generation for every fixture, engine and labelling combination.
+
+    Each case runs in a freshly spawned process, so the peak RSS is its own and the
+    first run is not helped by caches warmed by earlier cases.
+    """
+    results = []
+    context = multiprocessing.get_context("spawn")
+
+    for fixture in fixtures:
+        for engine in engines:
+            for labelled in (False, True):
+                if labelled and engine == ModelEngine.Mesh:
+                    continue
+
+                label = (
+                    f"benchmark\n{fixture.year} - All Contributions"
+                    if labelled
+                    else None
+                )
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(
+                        _run_case,
+                        engine,
+                        fixture.days,
+                        label,
+                        labelled,
+                        repeats,
+                    ).result()
+
+                results.append(
+                    {
+                        "fixture": fixture.name,
+                        "year": fixture.year,
+                        "engine": engine.value,
+                        "labelled": labelled,
+                        **result,
+                    }
+                )
+
+    return results
+
+
+__all__ = ["benchmark_generation"]
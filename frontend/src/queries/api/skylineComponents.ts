@@ -63,10 +63,6 @@ export type StartImportError = Fetcher.ErrorWrapper<
           status: 401;
           payload: Schemas.ErrorResponseSchema;
       }
-    | {
-          status: 409;
-          payload: Schemas.ErrorResponseSchema;
-      }
     | {
           status: 422;
           payload: Schemas.HTTPValidationError;
@@ -78,10 +74,12 @@ export type StartImportVariables = {
 } & SkylineContext['fetcherOptions'];
 
 /**
- * Import contributions for the current user.
+ * Start importing contributions for the current user.
+ *
+ * The import runs in the background; poll the returned job for its status.
  */
 export const fetchStartImport = (variables: StartImportVariables, signal?: AbortSignal) =>
-    skylineFetch<undefined, StartImportError, undefined, {}, {}, StartImportPathParams>({
+    skylineFetch<Schemas.ImportJobSchema, StartImportError, undefined, {}, {}, StartImportPathParams>({
         url: '/contributions/import/{year}',
         method: 'post',
         ...variables,
@@ -89,18 +87,79 @@ export const fetchStartImport = (variables: StartImportVariables, signal?: Abort
     });
 
 /**
- * Import contributions for the current user.
+ * Start importing contributions for the current user.
+ *
+ * The import runs in the background; poll the returned job for its status.
  */
 export const useStartImport = (
-    options?: Omit<reactQuery.UseMutationOptions<undefined, StartImportError, StartImportVariables>, 'mutationFn'>,
+    options?: Omit<
+        reactQuery.UseMutationOptions<Schemas.ImportJobSchema, StartImportError, StartImportVariables>,
+        'mutationFn'
+    >,
 ) => {
     const { fetcherOptions } = useSkylineContext();
-    return reactQuery.useMutation<undefined, StartImportError, StartImportVariables>({
+    return reactQuery.useMutation<Schemas.ImportJobSchema, StartImportError, StartImportVariables>({
         mutationFn: (variables: StartImportVariables) => fetchStartImport({ ...fetcherOptions, ...variables }),
         ...options,
     });
 };
 
+export type GetImportJobPathParams = {
+    /**
+     * The ID of the import job.
+     */
+    jobId: string;
+};
+
+export type GetImportJobError = Fetcher.ErrorWrapper<
+    | {
+          status: 404;
+          payload: Schemas.ErrorResponseSchema;
+      }
+    | {
+          status: 422;
+          payload: Schemas.HTTPValidationError;
+      }
+>;
+
+export type GetImportJobVariables = {
+    pathParams: GetImportJobPathParams;
+} & SkylineContext['fetcherOptions'];
+
+/**
+ * Retrieve the status of an import job.
+ */
+export const fetchGetImportJob = (variables: GetImportJobVariables, signal?: AbortSignal) =>
+    skylineFetch<Schemas.ImportJobSchema, GetImportJobError, undefined, {}, {}, GetImportJobPathParams>({
+        url: '/contributions/import-jobs/{jobId}',
+        method: 'get',
+        ...variables,
+        signal,
+    });
+
+/**
+ * Retrieve the status of an import job.
+ */
+export const useGetImportJob = <TData = Schemas.ImportJobSchema>(
+    variables: GetImportJobVariables,
+    options?: Omit<
+        reactQuery.UseQueryOptions<Schemas.ImportJobSchema, GetImportJobError, TData>,
+        'queryKey' | 'queryFn' | 'initialData'
+    >,
+) => {
+    const { fetcherOptions, queryOptions, queryKeyFn } = useSkylineContext(options);
+    return reactQuery.useQuery<Schemas.ImportJobSchema, GetImportJobError, TData>({
+        queryKey: queryKeyFn({
+            path: '/contributions/import-jobs/{jobId}',
+            operationId: 'getImportJob',
+            variables,
+        }),
+        queryFn: ({ signal }) => fetchGetImportJob({ ...fetcherOptions, ...variables }, signal),
+        ...options,
+        ...queryOptions,
+    });
+};
+
 export type GetModelPathParams = {
     year: number;
 };
@@ -250,6 +309,11 @@ export type QueryOperation =
           operationId: 'getCurrentUser';
           variables: GetCurrentUserVariables;
       }
+    | {
+          path: '/contributions/import-jobs/{jobId}';
+          operationId: 'getImportJob';
+          variables: GetImportJobVariables;
+      }
     | {
           path: '/contributions/model/{year}';
           operationId: 'getModel';
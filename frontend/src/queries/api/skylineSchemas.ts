@@ -17,6 +17,34 @@ export type HTTPValidationError = {
     detail?: ValidationError[];
 };
 
+/**
+ * A background job importing contributions.
+ */
+export type ImportJobSchema = {
+    /**
+     * The ID of the job, used to poll its status.
+     */
+    id: string;
+    /**
+     * The current status of the job.
+     */
+    status: ImportJobStatus;
+    /**
+     * The years the job is importing.
+     */
+    years: number[];
+    /**
+     * The years which were imported, once the job has succeeded. Years which had already been imported are not included.
+     */
+    imported_years: number[];
+    /**
+     * Why the job failed, if it did.
+     */
+    error: string | null;
+};
+
+export type ImportJobStatus = 'queued' | 'running' | 'succeeded' | 'failed';
+
 export type ModelContributionSelection = 'all' | 'personal' | 'work';
 
 export type ValidationError = {
@@ -3,11 +3,19 @@ import { GitHubIcon } from '@/icons/GitHub';
 import { queryClient } from '@/lib/query';
 import { useStore } from '@/lib/state';
 import { cn, getModelUrl, ModelConfiguration, onQueryError } from '@/lib/util';
-import { useGetYears, useStartImport, useWorkContributionsAvailable } from '@/queries/api/skylineComponents';
+import {
+    fetchGetImportJob,
+    useGetYears,
+    useStartImport,
+    useWorkContributionsAvailable,
+} from '@/queries/api/skylineComponents';
 import { useFloating, useHover, useInteractions, useTransitionStyles } from '@floating-ui/react';
 import { Button, Field, Input, Label, Radio, RadioGroup, Select } from '@headlessui/react';
 import { Circle, CircleCheckBig } from 'lucide-react';
 import { type ChangeEvent, useEffect, useState } from 'react';
+import { toast } from 'sonner';
+
+const IMPORT_POLL_INTERVAL_MS = 1000;
 
 function LoginPrompt() {
     return (
@@ -147,6 +155,7 @@ function BottomBar() {
     const { mutateAsync: importYear, isPending: importPending } = useStartImport({
         onError: onQueryError,
     });
+    const [importRunning, setImportRunning] = useState(false);
 
     // Tooltip hooks
     const [importExplanationTooltipOpen, setImportExplanationTooltipOpen] = useState(false);
@@ -174,7 +183,7 @@ function BottomBar() {
         }
     }, [setContributions, workContributionsAvailable, modelOptions.contributions, workContributionsAvailablePending]);
 
-    if (yearsPending || importPending || availableYears === undefined) {
+    if (yearsPending || importPending || importRunning || availableYears === undefined) {
         return (
             <div className="flex h-56 flex-col items-center justify-center bg-zinc-800 md:grid-cols-2">
                 <div className="h-24 w-24 animate-spin rounded-full border-r-2 border-emerald-500"></div>
@@ -187,7 +196,26 @@ function BottomBar() {
             return;
         }
 
-        await importYear({ pathParams: { year: importYearSelection } });
+        let job = await importYear({ pathParams: { year: importYearSelection } });
+
+        setImportRunning(true);
+        try {
+            while (job.status === 'queued' || job.status === 'running') {
+                await new Promise((resolve) => setTimeout(resolve, IMPORT_POLL_INTERVAL_MS));
+                job = await fetchGetImportJob({ pathParams: { jobId: job.id } });
+            }
+        } catch (error) {
+            onQueryError(error);
+            return;
+        } finally {
+            setImportRunning(false);
+        }
+
+        if (job.status === 'failed') {
+            toast.error(job.error ?? 'Failed to import contributions.');
+            return;
+        }
+
         queryClient.invalidateQueries({ queryKey: ['contributions', 'years'] });
         setYear(importYearSelection);
         setImportYearSelection(null);
@@ -271,7 +299,7 @@ function BottomBar() {
                             className="flex-1 rounded-md bg-zinc-900 p-4"
                             type="number"
                             min={2005}
-                            max={new Date().getFullYear() - 1}
+                            max={new Date().getFullYear()}
                             value={importYearSelection || ''}
                             onChange={(e: ChangeEvent<HTMLInputElement>) =>
                                 setImportYearSelection(parseInt(e.target.value, 10) || null)
@@ -1,3 +1,6 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from fastapi.staticfiles import StaticFiles
@@ -6,8 +9,19 @@ from starlette.middleware.sessions import SessionMiddleware
 from starlette.responses import Response
 from starlette.types import Scope
 
+from skyline.cad.pool import model_pool
 from skyline.config import config
-from skyline.routers import auth_router, contributions_router
+from skyline.middleware import StageTimingMiddleware
+from skyline.routers import (
+    admin_router,
+    auth_router,
+    contributions_router,
+    metrics_router,
+)
+from skyline.tasks.github import github_client
+from skyline.tasks.jobs import import_job_queue
+from skyline.tasks.pregeneration import model_pregenerator
+from skyline.tasks.refresh import contribution_refresher
 
 
 def generate_unique_id(route: APIRoute) -> str:
@@ -25,15 +39,32 @@ class SPAStaticFiles(StaticFiles):
                 raise exc
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    model_pool.start()
+    import_job_queue.start()
+    contribution_refresher.start()
+    yield
+    await contribution_refresher.stop()
+    await import_job_queue.stop()
+    await model_pregenerator.stop()
+    model_pool.shutdown()
+    await github_client.aclose()
+
+
 app = FastAPI(
     title="Skyline",
     generate_unique_id_function=generate_unique_id,
+    lifespan=lifespan,
 )
 
 app.add_middleware(SessionMiddleware, secret_key=config.session_secret)
+app.add_middleware(StageTimingMiddleware)
 
+app.include_router(admin_router, prefix="/admin")
 app.include_router(auth_router, prefix="/auth")
 app.include_router(contributions_router, prefix="/contributions")
-app.mount("/", SPAStaticFiles(directory="frontend/dist", html=True), "frontend")
+app.include_router(metrics_router)
+app.mount("/", SPAStaticFiles(directory=config.frontend_dir, html=True), "frontend")
 
 __all__ = ["app"]
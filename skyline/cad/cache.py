@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from stat import S_ISREG
+from typing import Sequence
+from urllib.parse import quote
+
+import structlog
+
+from skyline.config import config
+
+logger = structlog.get_logger()
+
+# Bump whenever a change to model generation changes the produced bytes,
+# so previously cached models are no longer served
+GENERATOR_VERSION = 4
+
+
+def model_cache_key(
+    *,
+    days: Sequence[int | None],
+    label: str | None,
+    include_month_label: bool,
+    contribution_selection: str,
+    engine: str,
+    model_format: str,
+) -> str:
+    payload = json.dumps(
+        {
+            "version": GENERATOR_VERSION,
+            "days": list(days),
+            "label": label,
+            "include_month_label": include_month_label,
+            "contribution_selection": contribution_selection,
+            "engine": engine,
+            "format": model_format,
+        },
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ModelCache:
+    """Two-tier cache of generated models, keyed by `model_cache_key`.
+
+    The memory tier is an LRU bounded by the total size of the cached models. The disk
+    tier survives restarts and is bounded by its total size too, evicting the least
+    recently used files. Entries are grouped by user and year so they can be dropped
+    when that year's contributions are re-imported.
+    """
+
+    def __init__(
+        self, *, memory_budget: int, disk_budget: int, directory: str | None
+    ) -> None:
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self.directory = Path(directory) if directory else None
+
+        self._memory: OrderedDict[str, tuple[tuple[str, int], bytes]] = OrderedDict()
+        self._memory_size = 0
+
+        # Disk I/O runs in worker threads, so the disk tier's accounting is guarded.
+        # Its size is only known once the directory is first scanned
+        self._disk_lock = threading.Lock()
+        self._disk_size: int | None = None
+
+    def _path(self, user: str, year: int, key: str | None = None) -> Path | None:
+        if self.directory is None:
+            return None
+        path = self.directory / quote(user, safe="") / str(year)
+        return path / key if key else path
+
+    def _remember(self, user: str, year: int, key: str, data: bytes) -> None:
+        if len(data) > self.memory_budget:
+            return
+
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key)[1])
+
+        self._memory[key] = ((user, year), data)
+        self._memory_size += len(data)
+
+        while self._memory_size > self.memory_budget:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _disk_files(self, directory: Path) -> list[tuple[float, int, Path]]:
+        files = []
+        for path in directory.rglob("*"):
+            # Writes still in progress are accounted for once they're renamed
+            if path.name.startswith(".tmp_"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if S_ISREG(stat.st_mode):
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _ensure_disk_size(self) -> int:
+        if self._disk_size is None:
+            assert self.directory is not None
+            self._disk_size = sum(
+                size for _, size, _ in self._disk_files(self.directory)
+            )
+        return self._disk_size
+
+    def _read(self, path: Path) -> bytes | None:
+        try:
+            data = path.read_bytes()
+            # The modification time doubles as the last use, for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def _write(self, path: Path, data: bytes) -> None:
+        if len(data) > self.disk_budget:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial model
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+
+            with self._disk_lock:
+                self._ensure_disk_size()
+                try:
+                    replaced = path.stat().st_size
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(tmp_path, path)
+                self._disk_size += len(data) - replaced
+
+                if self._disk_size > self.disk_budget:
+                    self._evict()
+        except OSError:
+            logger.exception("Failed to write model to disk cache", path=str(path))
+
+    def _evict(self) -> None:
+        assert self.directory is not None and self._disk_size is not None
+        # Rescanning also corrects any drift, e.g. from files removed by hand
+        files = sorted(self._disk_files(self.directory))
+        self._disk_size = sum(size for _, size, _ in files)
+
+        for _, size, path in files:
+            if self._disk_size <= self.disk_budget:
+                break
+            path.unlink(missing_ok=True)
+            self._disk_size -= size
+
+    def _remove(self, path: Path) -> None:
+        with self._disk_lock:
+            if self._disk_size is not None and path.is_dir():
+                self._disk_size -= sum(size for _, size, _ in self._disk_files(path))
+            shutil.rmtree(path, ignore_errors=True)
+
+    async def get(self, user: str, year: int, key: str) -> bytes | None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key][1]
+
+        path = self._path(user, year, key)
+        if path is None:
+            return None
+
+        data = await asyncio.to_thread(self._read, path)
+        if data is not None:
+            self._remember(user, year, key, data)
+        return data
+
+    async def put(self, user: str, year: int, key: str, data: bytes) -> None:
+        self._remember(user, year, key, data)
+
+        path = self._path(user, year, key)
+        if path is not None:
+            await asyncio.to_thread(self._write, path, data)
+
+    async def invalidate(self, user: str, year: int) -> None:
+        for key in [
+            k for k, (scope, _) in self._memory.items() if scope == (user, year)
+        ]:
+            self._memory_size -= len(self._memory.pop(key)[1])
+
+        path = self._path(user, year)
+        if path is not None:
+            await asyncio.to_thread(self._remove, path)
+
+
+model_cache = ModelCache(
+    memory_budget=config.model_cache_memory_bytes,
+    disk_budget=config.model_cache_disk_bytes,
+    directory=config.model_cache_dir,
+)
+
+__all__ = ["GENERATOR_VERSION", "ModelCache", "model_cache", "model_cache_key"]
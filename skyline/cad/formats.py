@@ -0,0 +1,167 @@
+import io
+import json
+import math
+import struct
+import sys
+import zipfile
+from array import array
+
+from skyline.schemas.contributions import ModelFormat
+
+from .mesh import Mesh
+
+MEDIA_TYPES = {
+    ModelFormat.STL: "model/stl",
+    ModelFormat.ThreeMF: "model/3mf",
+    ModelFormat.GLB: "model/gltf-binary",
+}
+
+_3MF_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>"""
+
+_3MF_RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>"""
+
+_3MF_MODEL_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<model unit="millimeter" xml:lang="en-US" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">
+<resources><object id="1" type="model"><mesh>
+"""
+
+_3MF_MODEL_FOOTER = """</mesh></object></resources>
+<build><item objectid="1"/></build>
+</model>"""
+
+# Rotates the Z-up model to glTF's Y-up, and scales millimetres to metres
+_GLB_NODE_ROTATION = [-math.sqrt(0.5), 0.0, 0.0, math.sqrt(0.5)]
+_GLB_NODE_SCALE = [0.001, 0.001, 0.001]
+
+_GLB_MAGIC = 0x46546C67
+_GLB_JSON_CHUNK = 0x4E4F534A
+_GLB_BIN_CHUNK = 0x004E4942
+
+
+def to_3mf(mesh: Mesh) -> bytes:
+    """Serialize the mesh as a 3MF package, with a single object."""
+    model = io.StringIO()
+    model.write(_3MF_MODEL_HEADER)
+
+    model.write("<vertices>\n")
+    for x, y, z in mesh.vertices:
+        model.write(f'<vertex x="{x:.7g}" y="{y:.7g}" z="{z:.7g}"/>\n')
+    model.write("</vertices>\n")
+
+    model.write("<triangles>\n")
+    for a, b, c in mesh.triangles:
+        # 3MF forbids triangles which reuse a vertex
+        if a != b and b != c and a != c:
+            model.write(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>\n')
+    model.write("</triangles>\n")
+
+    model.write(_3MF_MODEL_FOOTER)
+
+    package = io.BytesIO()
+    with zipfile.ZipFile(package, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _3MF_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _3MF_RELATIONSHIPS)
+        archive.writestr("3D/3dmodel.model", model.getvalue())
+
+    return package.getvalue()
+
+
+def _padded(data: bytes, padding: bytes) -> bytes:
+    return data + padding * (-len(data) % 4)
+
+
+def to_glb(mesh: Mesh) -> bytes:
+    """Serialize the mesh as a binary glTF, with indexed positions and no normals.
+
+    Viewers compute flat normals for meshes without them, which suits the skyline's
+    flat faces.
+    """
+    positions = array(
+        "f", (coordinate for vertex in mesh.vertices for coordinate in vertex)
+    )
+    indices = array("I", (index for triangle in mesh.triangles for index in triangle))
+    # glTF buffers are little-endian
+    if sys.byteorder == "big":
+        positions.byteswap()
+        indices.byteswap()
+
+    positions_bytes = positions.tobytes()
+    indices_bytes = indices.tobytes()
+    binary = positions_bytes + indices_bytes
+
+    # Bounds must match the stored single precision positions exactly
+    lower, upper = (array("f", bound).tolist() for bound in mesh.bounds())
+    document = {
+        "asset": {"version": "2.0", "generator": "Skyline"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [
+            {"mesh": 0, "rotation": _GLB_NODE_ROTATION, "scale": _GLB_NODE_SCALE}
+        ],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1}]}],
+        "buffers": [{"byteLength": len(binary)}],
+        "bufferViews": [
+            {
+                "buffer": 0,
+                "byteOffset": 0,
+                "byteLength": len(positions_bytes),
+                "target": 34962,  # ARRAY_BUFFER
+            },
+            {
+                "buffer": 0,
+                "byteOffset": len(positions_bytes),
+                "byteLength": len(indices_bytes),
+                "target": 34963,  # ELEMENT_ARRAY_BUFFER
+            },
+        ],
+        "accessors": [
+            {
+                "bufferView": 0,
+                "componentType": 5126,  # FLOAT
+                "count": len(mesh.vertices),
+                "type": "VEC3",
+                "min": lower,
+                "max": upper,
+            },
+            {
+                "bufferView": 1,
+                "componentType": 5125,  # UNSIGNED_INT
+                "count": len(indices),
+                "type": "SCALAR",
+            },
+        ],
+    }
+
+    json_chunk = _padded(json.dumps(document, separators=(",", ":")).encode(), b" ")
+    bin_chunk = _padded(binary, b"\0")
+    length = 12 + 8 + len(json_chunk) + 8 + len(bin_chunk)
+
+    return b"".join(
+        (
+            struct.pack("<III", _GLB_MAGIC, 2, length),
+            struct.pack("<II", len(json_chunk), _GLB_JSON_CHUNK),
+            json_chunk,
+            struct.pack("<II", len(bin_chunk), _GLB_BIN_CHUNK),
+            bin_chunk,
+        )
+    )
+
+
+def export_mesh(mesh: Mesh, model_format: ModelFormat) -> bytes:
+    match model_format:
+        case ModelFormat.STL:
+            return mesh.to_stl()
+        case ModelFormat.ThreeMF:
+            return to_3mf(mesh)
+        case ModelFormat.GLB:
+            return to_glb(mesh)
+
+
+__all__ = ["MEDIA_TYPES", "export_mesh", "to_3mf", "to_glb"]
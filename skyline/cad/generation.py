@@ -0,0 +1,48 @@
+from typing import Sequence
+
+from skyline.schemas.contributions import (
+    ModelContributionSelection,
+    ModelEngine,
+    ModelFormat,
+)
+from skyline.timing import stage
+
+from .formats import export_mesh
+from .skyline import skyline_model
+from .skyline_mesh import skyline_mesh
+
+
+def model_label(
+    user: str, years: str, contribution_selection: ModelContributionSelection
+) -> str:
+    """Build the label engraved into a labelled model."""
+    return (
+        f"{user}\n{years} - {contribution_selection.value.capitalize()} Contributions"
+    )
+
+
+def generate_model(
+    *,
+    engine: ModelEngine,
+    days: Sequence[int | None],
+    label: str | None,
+    include_month_label: bool,
+    model_format: ModelFormat,
+) -> bytes:
+    match engine:
+        case ModelEngine.CadQuery | ModelEngine.CadQueryMerged:
+            mesh = skyline_model(
+                days=days,
+                label=label,
+                include_month_label=include_month_label,
+                merge_columns=engine == ModelEngine.CadQueryMerged,
+            )
+        case ModelEngine.Mesh:
+            with stage("mesh_build"):
+                mesh = skyline_mesh(days=days)
+
+    with stage("export"):
+        return export_mesh(mesh, model_format)
+
+
+__all__ = ["generate_model", "model_label"]
@@ -0,0 +1,129 @@
+import math
+import struct
+from typing import Sequence
+
+type Point = tuple[float, float, float]
+
+STL_HEADER = b"Skyline binary STL".ljust(80, b"\0")
+
+_stl_count = struct.Struct("<I")
+_stl_triangle = struct.Struct("<12fH")
+
+
+class Mesh:
+    """An indexed triangle mesh, with vertices deduplicated by position."""
+
+    def __init__(self) -> None:
+        self.vertices: list[Point] = []
+        self.triangles: list[tuple[int, int, int]] = []
+        self._vertex_indices: dict[Point, int] = {}
+
+    def vertex(self, point: Point) -> int:
+        index = self._vertex_indices.get(point)
+        if index is None:
+            index = len(self.vertices)
+            self.vertices.append(point)
+            self._vertex_indices[point] = index
+        return index
+
+    def add_triangle(self, a: Point, b: Point, c: Point) -> None:
+        """Add a triangle, wound counter-clockwise when viewed from outside the solid."""
+        self.triangles.append((self.vertex(a), self.vertex(b), self.vertex(c)))
+
+    def add_quad(self, a: Point, b: Point, c: Point, d: Point) -> None:
+        """Add a planar quad, wound counter-clockwise when viewed from outside the solid."""
+        self.add_triangle(a, b, c)
+        self.add_triangle(a, c, d)
+
+    def extend(self, other: "Mesh") -> None:
+        """Add every triangle of another mesh."""
+        for a, b, c in other.triangles:
+            self.triangles.append(
+                (
+                    self.vertex(other.vertices[a]),
+                    self.vertex(other.vertices[b]),
+                    self.vertex(other.vertices[c]),
+                )
+            )
+
+    def bounds(self) -> tuple[Point, Point]:
+        xs, ys, zs = zip(*self.vertices)
+        return (min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs))
+
+    def volume(self) -> float:
+        """Compute the enclosed volume. Only meaningful for a closed, consistently wound mesh."""
+        total = 0.0
+        for a, b, c in self.triangles:
+            (ax, ay, az), (bx, by, bz), (cx, cy, cz) = (
+                self.vertices[a],
+                self.vertices[b],
+                self.vertices[c],
+            )
+            total += (
+                ax * (by * cz - bz * cy)
+                - ay * (bx * cz - bz * cx)
+                + az * (bx * cy - by * cx)
+            )
+        return total / 6
+
+    def to_stl(self) -> bytes:
+        """Serialize the mesh as a binary STL."""
+        buffer = bytearray(
+            len(STL_HEADER) + _stl_count.size + _stl_triangle.size * len(self.triangles)
+        )
+        buffer[: len(STL_HEADER)] = STL_HEADER
+        _stl_count.pack_into(buffer, len(STL_HEADER), len(self.triangles))
+
+        offset = len(STL_HEADER) + _stl_count.size
+        for a, b, c in self.triangles:
+            va, vb, vc = self.vertices[a], self.vertices[b], self.vertices[c]
+            _stl_triangle.pack_into(
+                buffer, offset, *_normal(va, vb, vc), *va, *vb, *vc, 0
+            )
+            offset += _stl_triangle.size
+
+        return bytes(buffer)
+
+
+def _normal(a: Point, b: Point, c: Point) -> Point:
+    ux, uy, uz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    vx, vy, vz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+    nx, ny, nz = uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx
+    length = math.sqrt(nx * nx + ny * ny + nz * nz) or 1.0
+    return nx / length, ny / length, nz / length
+
+
+def ladder(
+    mesh: Mesh,
+    start: tuple[float, float],
+    end: tuple[float, float],
+    start_heights: Sequence[float],
+    end_heights: Sequence[float],
+) -> None:
+    """Triangulate a vertical wall between two vertical edges with differing split points.
+
+    `start_heights` and `end_heights` are ascending and share their first and last values.
+    The wall faces towards the right of the `start` -> `end` direction.
+    """
+    i = j = 0
+    while i < len(start_heights) - 1 or j < len(end_heights) - 1:
+        advance_end = i == len(start_heights) - 1 or (
+            j < len(end_heights) - 1 and end_heights[j + 1] <= start_heights[i + 1]
+        )
+        if advance_end:
+            mesh.add_triangle(
+                (*start, start_heights[i]),
+                (*end, end_heights[j]),
+                (*end, end_heights[j + 1]),
+            )
+            j += 1
+        else:
+            mesh.add_triangle(
+                (*start, start_heights[i]),
+                (*end, end_heights[j]),
+                (*start, start_heights[i + 1]),
+            )
+            i += 1
+
+
+__all__ = ["Mesh", "Point", "ladder"]
@@ -0,0 +1,196 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Sequence
+
+import structlog
+
+from skyline.config import config
+from skyline.metrics import (
+    MODEL_GENERATIONS_COALESCED,
+    MODEL_GENERATIONS_IN_FLIGHT,
+    MODEL_GENERATIONS_REJECTED,
+)
+from skyline.schemas.contributions import ModelEngine, ModelFormat
+from skyline.timing import collect_stages, current_timings
+
+from .generation import generate_model
+
+logger = structlog.get_logger()
+
+
+class ModelGenerationOverloaded(Exception):
+    """Raised when every worker is busy and the generation queue is full."""
+
+
+def _initialize_worker() -> None:
+    # Importing CadQuery loads OCCT, which takes a few seconds.
+    # Do it as soon as the worker starts rather than on its first request.
+    import cadquery  # noqa: F401 # type: ignore
+    import OCP  # noqa: F401 # type: ignore
+
+    from .skyline import prebuild_text
+
+    prebuild_text()
+
+
+def _noop() -> None:
+    pass
+
+
+def _wait_for(barrier: Any) -> None:
+    barrier.wait()
+
+
+def _generate_timed(
+    *,
+    engine: ModelEngine,
+    days: Sequence[int | None],
+    label: str | None,
+    include_month_label: bool,
+    model_format: ModelFormat,
+) -> tuple[bytes, dict[str, float]]:
+    # Stages run in the worker, so their timings are sent back with the model
+    with collect_stages() as timings:
+        model = generate_model(
+            engine=engine,
+            days=days,
+            label=label,
+            include_month_label=include_month_label,
+            model_format=model_format,
+        )
+    return model, timings.durations
+
+
+class ModelGenerationPool:
+    """Runs model generation in worker processes, off the event loop.
+
+    At most `workers` models are generated at once, with up to `queue_depth` more
+    waiting for a free worker. Submissions beyond that are rejected with
+    `ModelGenerationOverloaded` instead of piling up.
+
+    Concurrent submissions with the same key share a single generation, so bursts of
+    identical requests only cost one model's worth of work.
+    """
+
+    def __init__(self, *, workers: int, queue_depth: int) -> None:
+        self.workers = workers
+        self.queue_depth = queue_depth
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._in_flight = 0
+        self._generations: dict[str, asyncio.Task[tuple[bytes, dict[str, float]]]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def start(self) -> None:
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+        )
+
+        # Workers are spawned lazily, so submit a no-op per worker to start them all now
+        for _ in range(self.workers):
+            self._executor.submit(_noop)
+
+        logger.info("Started model generation pool", workers=self.workers)
+
+    def restart(self) -> None:
+        """Replace the workers with fresh ones, dropping the geometry they've cached.
+
+        Blocks until every new worker has started, so it's only meant for benchmarks.
+        """
+        self.shutdown()
+        self.start()
+        assert self._executor is not None
+
+        with multiprocessing.get_context("spawn").Manager() as manager:
+            # Only passable once every worker is running one of these at the same time
+            barrier = manager.Barrier(self.workers)
+            waits = [
+                self._executor.submit(_wait_for, barrier) for _ in range(self.workers)
+            ]
+            for wait in waits:
+                wait.result()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(
+        self, executor: ProcessPoolExecutor, **kwargs: Any
+    ) -> tuple[bytes, dict[str, float]]:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, partial(_generate_timed, **kwargs)
+            )
+        finally:
+            self._in_flight -= 1
+            MODEL_GENERATIONS_IN_FLIGHT.dec()
+
+    async def generate(
+        self,
+        *,
+        key: str,
+        engine: ModelEngine,
+        days: Sequence[int | None],
+        label: str | None,
+        include_month_label: bool,
+        model_format: ModelFormat,
+    ) -> bytes:
+        """Generate a model, or wait for an identical one already being generated.
+
+        `key` must identify every input to the model, such as its `model_cache_key`.
+        """
+        if self._executor is None:
+            raise RuntimeError("Model generation pool has not been started")
+
+        generation = self._generations.get(key)
+        started = generation is None
+        if generation is not None:
+            MODEL_GENERATIONS_COALESCED.inc()
+        else:
+            if self._in_flight >= self.workers + self.queue_depth:
+                MODEL_GENERATIONS_REJECTED.inc()
+                raise ModelGenerationOverloaded()
+
+            # Counted now rather than once the task runs, so every submission in a
+            # burst sees the ones before it
+            self._in_flight += 1
+            MODEL_GENERATIONS_IN_FLIGHT.inc()
+
+            # Run as its own task, so it isn't cancelled if the request which started
+            # it goes away while others are still waiting on it
+            generation = asyncio.create_task(
+                self._run(
+                    self._executor,
+                    engine=engine,
+                    days=list(days),
+                    label=label,
+                    include_month_label=include_month_label,
+                    model_format=model_format,
+                )
+            )
+            self._generations[key] = generation
+            generation.add_done_callback(lambda _: self._generations.pop(key, None))
+
+        model, durations = await asyncio.shield(generation)
+
+        # Only report the worker's stages once, rather than for every waiting request
+        if started and (timings := current_timings()) is not None:
+            timings.update(durations)
+
+        return model
+
+
+model_pool = ModelGenerationPool(
+    workers=config.model_pool_workers,
+    queue_depth=config.model_queue_depth,
+)
+
+__all__ = ["ModelGenerationOverloaded", "ModelGenerationPool", "model_pool"]
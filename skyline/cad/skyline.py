@@ -1,15 +1,64 @@
 import math
-import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Self, Sequence
+from typing import Self, Sequence, cast
 
 import cadquery
 
+from skyline.timing import stage
+
+from .mesh import Mesh
+
 GRID_SQUARE_SIZE = 3
 GRID_BASE_HEIGHT = 2
 
+# Match the tolerances CadQuery uses when exporting STL files
+TESSELLATION_TOLERANCE = 0.1
+TESSELLATION_ANGULAR_TOLERANCE = 0.1
+
 INTER_FONT_PATH = str(Path(__file__).parent / "fonts" / "Inter-Regular.ttf")
 
+LABEL_FONT_SIZE = 7.5
+LABEL_DEPTH = -1.0
+MONTH_LABELS = ("Jan", "Dec")
+
+
+@lru_cache(maxsize=128)
+def text_solid(
+    text: str,
+    size: float,
+    depth: float,
+    font_path: str,
+    valign: str = "center",
+) -> cadquery.Shape:
+    """Build the solid for a piece of text, positioned on the XY plane.
+
+    Building text loads the font and extrudes every glyph outline, so solids are
+    cached and only moved into place.
+    """
+    return cadquery.Compound.makeText(
+        text,
+        size,
+        depth,
+        fontPath=font_path,
+        valign=valign,  # type: ignore - validated by makeText
+    )
+
+
+def prebuild_text() -> None:
+    """Build the month labels, which are shared by every labelled model."""
+    for month in MONTH_LABELS:
+        text_solid(month, LABEL_FONT_SIZE, LABEL_DEPTH, INTER_FONT_PATH, "top")
+
+
+def placed_text(
+    workplane: cadquery.Workplane, text: str, *, valign: str = "center"
+) -> cadquery.Shape:
+    """Position a label's solid on a workplane, like `Workplane.text` does."""
+    solid = text_solid(text, LABEL_FONT_SIZE, LABEL_DEPTH, INTER_FONT_PATH, valign)
+    return solid.transformShape(workplane.plane.rG)
+
 
 class PendingPolyline:
     def __init__(self, offset_x: int | float = 0, offset_y: int | float = 0):
@@ -30,19 +79,106 @@ class PendingPolyline:
         return self
 
 
-def skyline_model(
-    *,
-    days: Sequence[int | None],
-    label: str | None = "",
-    include_month_label: bool = True,
-) -> bytes:
-    cols = math.floor(len(days) / 7.0)
-    first_day_row = days.index(next(day for day in days if day is not None))
-    # First week is None-padded, but last week is not None-padded
-    # Therefore, to get the row of the last day we use the length of the last week
-    last_day_row = len(days[7 * cols :]) - 1
-    center_row_offset = -GRID_SQUARE_SIZE * 7 / 2
-    center_col_offset = -GRID_SQUARE_SIZE * cols / 2
+@dataclass(frozen=True)
+class SkylineLayout:
+    """Grid geometry shared by every model engine for a given padded `days` sequence."""
+
+    cols: int
+    first_day_row: int
+    last_day_row: int
+    center_row_offset: float
+    center_col_offset: float
+
+    @classmethod
+    def from_days(cls, days: Sequence[int | None]) -> Self:
+        cols = math.floor(len(days) / 7.0)
+        first_day_row = days.index(next(day for day in days if day is not None))
+        # First week is None-padded, but last week is not None-padded
+        # Therefore, to get the row of the last day we use the length of the last week
+        last_day_row = len(days[7 * cols :]) - 1
+
+        return cls(
+            cols=cols,
+            first_day_row=first_day_row,
+            last_day_row=last_day_row,
+            center_row_offset=-GRID_SQUARE_SIZE * 7 / 2,
+            center_col_offset=-GRID_SQUARE_SIZE * cols / 2,
+        )
+
+
+@dataclass(frozen=True)
+class SkylineColumn:
+    """A rectangular block of grid squares which all share the same contribution count."""
+
+    row: int
+    col: int
+    rows: int
+    cols: int
+    count: int
+
+
+def skyline_columns(
+    days: Sequence[int | None], *, merge: bool = False
+) -> list[SkylineColumn]:
+    """Find the columns to raise above the base plate.
+
+    Without `merge`, every day with contributions gets its own column. With `merge`,
+    neighbouring days with equal counts are greedily combined into rectangles, each
+    grown along its week row first and then across rows.
+    """
+    counts: dict[tuple[int, int], int] = {
+        (index % 7, index // 7): count for index, count in enumerate(days) if count
+    }
+
+    if not merge:
+        return [
+            SkylineColumn(row=row, col=col, rows=1, cols=1, count=count)
+            for (row, col), count in counts.items()
+        ]
+
+    columns: list[SkylineColumn] = []
+    claimed: set[tuple[int, int]] = set()
+
+    def matches(row: int, col: int, count: int) -> bool:
+        return (row, col) not in claimed and counts.get((row, col)) == count
+
+    for (row, col), count in sorted(counts.items()):
+        if (row, col) in claimed:
+            continue
+
+        cols = 1
+        while matches(row, col + cols, count):
+            cols += 1
+
+        rows = 1
+        while all(matches(row + rows, c, count) for c in range(col, col + cols)):
+            rows += 1
+
+        claimed.update(
+            (r, c) for r in range(row, row + rows) for c in range(col, col + cols)
+        )
+        columns.append(
+            SkylineColumn(row=row, col=col, rows=rows, cols=cols, count=count)
+        )
+
+    return columns
+
+
+@lru_cache(maxsize=16)
+def base_shape(
+    layout: SkylineLayout, label: str | None, include_month_label: bool
+) -> cadquery.Shape:
+    """Build the base plate, with any labels engraved into its underside.
+
+    Engraving text is by far the slowest part of building a labelled model. The base
+    only depends on the year's layout and the label, so it is cached and reused when
+    a year's model is regenerated after its contributions change.
+    """
+    cols = layout.cols
+    first_day_row = layout.first_day_row
+    last_day_row = layout.last_day_row
+    center_row_offset = layout.center_row_offset
+    center_col_offset = layout.center_col_offset
 
     base_polyline = PendingPolyline(center_row_offset, center_col_offset)
 
@@ -74,62 +210,61 @@ def skyline_model(
         .extrude(GRID_BASE_HEIGHT)
     )
 
+    base = cast(cadquery.Shape, skyline_workplane.val())
+    bottom_workplane = skyline_workplane.faces("<Z").workplane()
+    labels: list[cadquery.Shape] = []
+
     if label:
-        skyline_workplane = (
-            skyline_workplane.faces("<Z")
-            .workplane()
-            .transformed(rotate=cadquery.Vector(0, 0, -90))
-            .text(
+        labels.append(
+            placed_text(
+                bottom_workplane.transformed(rotate=cadquery.Vector(0, 0, -90)),
                 label,
-                7.5,
-                -1.0,
-                fontPath=INTER_FONT_PATH,
             )
         )
 
     if include_month_label:
-        skyline_workplane = (
-            skyline_workplane.faces("<Z")
-            .workplane()
-            # TODO: Use a better way to position the label rather than a hardcoded offset
-            .transformed(
-                offset=cadquery.Vector(0, -1 * center_col_offset - GRID_SQUARE_SIZE, 0)
-            )
-            .text(
-                "Jan",
-                7.5,
-                -1.0,
-                fontPath=INTER_FONT_PATH,
-                valign="top",
-            )
-            # TODO: Use a better way to position the label rather than a hardcoded offset
-            .transformed(
-                offset=cadquery.Vector(0, 2 * center_col_offset + GRID_SQUARE_SIZE, 0),
-                rotate=cadquery.Vector(0, 0, 180),
-            )
-            .text(
-                "Dec",
-                7.5,
-                -1.0,
-                fontPath=INTER_FONT_PATH,
-                valign="top",
-            )
+        # TODO: Use a better way to position the label rather than a hardcoded offset
+        jan_workplane = bottom_workplane.transformed(
+            offset=cadquery.Vector(0, -1 * center_col_offset - GRID_SQUARE_SIZE, 0)
+        )
+        # TODO: Use a better way to position the label rather than a hardcoded offset
+        dec_workplane = jan_workplane.transformed(
+            offset=cadquery.Vector(0, 2 * center_col_offset + GRID_SQUARE_SIZE, 0),
+            rotate=cadquery.Vector(0, 0, 180),
         )
+        labels.append(placed_text(jan_workplane, "Jan", valign="top"))
+        labels.append(placed_text(dec_workplane, "Dec", valign="top"))
 
-    grid = cadquery.Assembly()
+    if not labels:
+        return base
 
-    for index, count in enumerate(days):
-        col_offset = center_col_offset + GRID_SQUARE_SIZE * (index // 7)
-        row_offset = center_row_offset + GRID_SQUARE_SIZE * (index % 7)
+    # Engrave every label with a single boolean operation, rather than one each
+    return base.cut(*labels).clean()
 
-        if not count:
-            continue
+
+@lru_cache(maxsize=16)
+def base_mesh(
+    layout: SkylineLayout, label: str | None, include_month_label: bool
+) -> Mesh:
+    """Tessellate the base plate. The result is shared, so must not be modified."""
+    return tessellate(base_shape(layout, label, include_month_label))
+
+
+def grid_shape(
+    days: Sequence[int | None], layout: SkylineLayout, *, merge_columns: bool
+) -> cadquery.Compound:
+    """Build the columns standing on the base plate."""
+    grid = cadquery.Assembly()
+
+    for column in skyline_columns(days, merge=merge_columns):
+        col_offset = layout.center_col_offset + GRID_SQUARE_SIZE * column.col
+        row_offset = layout.center_row_offset + GRID_SQUARE_SIZE * column.row
 
         grid.add(
             cadquery.Workplane("XY").box(
-                GRID_SQUARE_SIZE,
-                GRID_SQUARE_SIZE,
-                count,
+                GRID_SQUARE_SIZE * column.rows,
+                GRID_SQUARE_SIZE * column.cols,
+                column.count,
                 centered=False,
             ),
             loc=cadquery.Location(
@@ -137,13 +272,72 @@ def skyline_model(
             ),
         )
 
-    skyline_workplane = skyline_workplane.add(grid.toCompound())
+    return grid.toCompound()
+
+
+def skyline_shape(
+    *,
+    days: Sequence[int | None],
+    label: str | None = "",
+    include_month_label: bool = True,
+    merge_columns: bool = False,
+) -> cadquery.Compound:
+    layout = SkylineLayout.from_days(days)
+    return cadquery.Compound.makeCompound(
+        [
+            base_shape(layout, label, include_month_label),
+            grid_shape(days, layout, merge_columns=merge_columns),
+        ]
+    )
+
+
+def tessellate(shape: cadquery.Shape) -> Mesh:
+    # Tessellate directly and write the STL ourselves, rather than exporting to a file
+    vertices, triangles = shape.tessellate(
+        TESSELLATION_TOLERANCE, TESSELLATION_ANGULAR_TOLERANCE
+    )
+
+    mesh = Mesh()
+    points = [vertex.toTuple() for vertex in vertices]
+    for a, b, c in triangles:
+        mesh.add_triangle(points[a], points[b], points[c])
+
+    return mesh
+
+
+def skyline_model(
+    *,
+    days: Sequence[int | None],
+    label: str | None = "",
+    include_month_label: bool = True,
+    merge_columns: bool = False,
+) -> Mesh:
+    layout = SkylineLayout.from_days(days)
+
+    with stage("cad_build"):
+        base_shape(layout, label, include_month_label)
+        grid = grid_shape(days, layout, merge_columns=merge_columns)
 
-    with tempfile.TemporaryDirectory(prefix="skyline_") as tmpdir:
-        skyline_workplane.export(f"{tmpdir}/skyline.stl")
+    # The base plate is tessellated separately, so its cached mesh can be reused
+    with stage("tessellate"):
+        mesh = Mesh()
+        mesh.extend(base_mesh(layout, label, include_month_label))
+        mesh.extend(tessellate(grid))
 
-        with open(f"{tmpdir}/skyline.stl", "rb") as f:
-            return f.read()
+    return mesh
 
 
-__all__ = ["skyline_model"]
+__all__ = [
+    "SkylineColumn",
+    "SkylineLayout",
+    "base_mesh",
+    "base_shape",
+    "grid_shape",
+    "placed_text",
+    "prebuild_text",
+    "skyline_columns",
+    "skyline_model",
+    "skyline_shape",
+    "tessellate",
+    "text_solid",
+]
@@ -0,0 +1,85 @@
+from typing import Sequence
+
+from .mesh import Mesh, ladder
+from .skyline import GRID_BASE_HEIGHT, GRID_SQUARE_SIZE, SkylineLayout
+
+# Outward direction of each side of a grid square, as (row, col) steps
+_SIDES = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def skyline_mesh(*, days: Sequence[int | None]) -> Mesh:
+    """Build the skyline as a closed height field, without going through CadQuery/OCCT.
+
+    Every present day becomes a column of height `GRID_BASE_HEIGHT + count`. The base plate
+    and the columns are never modelled as separate solids, so no internal faces are emitted:
+    each square gets a top and bottom face, and walls are only emitted where a square is taller
+    than its neighbour. Walls are split at every height meeting at their corners, so the result
+    has no T-junctions and is watertight.
+    """
+    layout = SkylineLayout.from_days(days)
+
+    heights: dict[tuple[int, int], float] = {}
+    for index, count in enumerate(days):
+        if count is None:
+            continue
+        heights[(index % 7, index // 7)] = GRID_BASE_HEIGHT + max(count, 0)
+
+    def height(row: int, col: int) -> float:
+        return heights.get((row, col), 0)
+
+    def point(row: int, col: int) -> tuple[float, float]:
+        return (
+            layout.center_row_offset + GRID_SQUARE_SIZE * row,
+            layout.center_col_offset + GRID_SQUARE_SIZE * col,
+        )
+
+    corner_heights: dict[tuple[int, int], list[float]] = {}
+
+    def splits(row: int, col: int, low: float, high: float) -> list[float]:
+        if (row, col) not in corner_heights:
+            corner_heights[(row, col)] = sorted(
+                {
+                    height(row - 1, col - 1),
+                    height(row, col - 1),
+                    height(row - 1, col),
+                    height(row, col),
+                }
+            )
+        return [low, *(h for h in corner_heights[(row, col)] if low < h < high), high]
+
+    mesh = Mesh()
+
+    for (row, col), h in heights.items():
+        (x0, y0), (x1, y1) = point(row, col), point(row + 1, col + 1)
+
+        mesh.add_quad((x0, y0, h), (x1, y0, h), (x1, y1, h), (x0, y1, h))
+        mesh.add_quad((x0, y0, 0), (x0, y1, 0), (x1, y1, 0), (x1, y0, 0))
+
+        for d_row, d_col in _SIDES:
+            neighbour_height = height(row + d_row, col + d_col)
+            if neighbour_height >= h:
+                continue
+
+            # Corners of this side, ordered so the wall faces away from the square
+            match (d_row, d_col):
+                case (1, 0):
+                    start, end = (row + 1, col), (row + 1, col + 1)
+                case (-1, 0):
+                    start, end = (row, col + 1), (row, col)
+                case (0, 1):
+                    start, end = (row + 1, col + 1), (row, col + 1)
+                case _:
+                    start, end = (row, col), (row + 1, col)
+
+            ladder(
+                mesh,
+                point(*start),
+                point(*end),
+                splits(*start, neighbour_height, h),
+                splits(*end, neighbour_height, h),
+            )
+
+    return mesh
+
+
+__all__ = ["skyline_mesh"]
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import alembic.config
@@ -6,6 +7,7 @@ import typer
 import uvicorn
 
 from skyline.config import config
+from skyline.schemas.contributions import ModelContributionSelection
 
 structlog.stdlib.recreate_defaults(log_level=logging.WARNING)
 structlog.stdlib.get_logger("skyline").setLevel(
@@ -34,4 +36,40 @@ def upgrade() -> None:
     alembic.config.main(argv=["--raiseerr", "upgrade", "head"])
 
 
+@app.command()
+def merge_report(
+    user: str,
+    year: int,
+    contributions: ModelContributionSelection = ModelContributionSelection.All,
+) -> None:
+    """Compare a CadQuery model's size with and without merging columns."""
+    # Imported here so other commands don't pay for loading CadQuery
+    from skyline.cad.skyline import skyline_columns, skyline_shape, tessellate
+    from skyline.db import async_session
+    from skyline.queries import fetch_year_contributions
+
+    async def _fetch():
+        async with async_session() as session, session.begin():
+            return await fetch_year_contributions(session, user, year)
+
+    year_contributions = asyncio.run(_fetch())
+    if year_contributions is None:
+        typer.echo(f"No contributions imported for {user} in {year}.", err=True)
+        raise typer.Exit(1)
+
+    days = year_contributions.padded_days(contributions)
+
+    typer.echo(f"{'':<10}{'columns':>10}{'faces':>10}{'triangles':>12}{'bytes':>12}")
+    for name, merge in (("separate", False), ("merged", True)):
+        shape = skyline_shape(days=days, label=None, merge_columns=merge)
+        mesh = tessellate(shape)
+        typer.echo(
+            f"{name:<10}"
+            f"{len(skyline_columns(days, merge=merge)):>10}"
+            f"{len(shape.Faces()):>10}"
+            f"{len(mesh.triangles):>12}"
+            f"{len(mesh.to_stl()):>12}"
+        )
+
+
 __all__ = ["app"]
@@ -2,8 +2,15 @@ import enum
 import typing
 
 import sqlalchemy
-from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncAttrs,
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from .config import config
 
@@ -15,6 +22,58 @@ class Base(AsyncAttrs, DeclarativeBase):
     }
 
 
-engine = create_async_engine(config.async_db_connection_uri, echo=config.db_log_queries)
+def _create_engine(
+    *, pool_size: int, max_overflow: int, read_only: bool
+) -> AsyncEngine:
+    """Create an engine for the configured database, tuned for its dialect.
+
+    SQLite pragmas are per-connection (apart from the journal mode, which is stored in
+    the database file), so they're applied to every new pooled connection.
+    """
+    new_engine = create_async_engine(
+        config.async_db_connection_uri,
+        echo=config.db_log_queries,
+        # SQLAlchemy doesn't pool aiosqlite connections by default, and rejects the
+        # pool's settings unless it's chosen explicitly
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=config.db_pool_timeout_seconds,
+    )
+
+    match new_engine.dialect.name:
+        case "sqlite":
+
+            @event.listens_for(new_engine.sync_engine, "connect")
+            def set_pragmas(dbapi_connection, _connection_record) -> None:
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f"PRAGMA busy_timeout = {config.db_busy_timeout_ms:d}")
+                cursor.execute(f"PRAGMA journal_mode = {config.db_journal_mode}")
+                cursor.execute(f"PRAGMA synchronous = {config.db_synchronous}")
+                cursor.execute(f"PRAGMA mmap_size = {config.db_mmap_size_bytes:d}")
+                if read_only:
+                    cursor.execute("PRAGMA query_only = ON")
+                cursor.close()
+
+        case "postgresql" if read_only:
+            new_engine = new_engine.execution_options(postgresql_readonly=True)
+
+    return new_engine
+
+
+engine = _create_engine(
+    pool_size=config.db_pool_size,
+    max_overflow=config.db_max_overflow,
+    read_only=False,
+)
+
+# Readers don't block the writer or each other (in SQLite's WAL mode), so read-only
+# requests get their own, larger pool and never queue behind connections held by imports
+read_engine = _create_engine(
+    pool_size=config.db_read_pool_size,
+    max_overflow=config.db_read_max_overflow,
+    read_only=True,
+)
 
 async_session = async_sessionmaker(engine, expire_on_commit=False)
+async_read_session = async_sessionmaker(read_engine, expire_on_commit=False)
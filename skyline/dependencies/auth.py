@@ -30,6 +30,13 @@ def require_user(request: Request) -> str:
     return username
 
 
+def require_admin(request: Request) -> str:
+    username = require_user(request)
+    if username not in config.admin_users:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return username
+
+
 def get_token(request: Request) -> Any | None:
     return request.session.get("token")
 
@@ -41,4 +48,11 @@ def require_token(request: Request) -> Any:
     return token
 
 
-__all__ = ["oauth", "get_username", "require_user", "get_token", "require_token"]
+__all__ = [
+    "oauth",
+    "get_username",
+    "require_user",
+    "require_admin",
+    "get_token",
+    "require_token",
+]
@@ -2,7 +2,7 @@ from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from skyline.db import async_session
+from skyline.db import async_read_session, async_session
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -10,4 +10,10 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-__all__ = ["get_db"]
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session from the read-only pool, for endpoints that never write."""
+    async with async_read_session() as session:
+        yield session
+
+
+__all__ = ["get_db", "get_read_db"]
@@ -0,0 +1,67 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+from skyline.timing import StageTimings
+
+STAGE_SECONDS = Histogram(
+    "skyline_stage_seconds",
+    "Time spent in each stage of an operation.",
+    ["operation", "stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+MODEL_CACHE_REQUESTS = Counter(
+    "skyline_model_cache_requests",
+    "Model cache lookups, by whether they hit.",
+    ["result"],
+)
+
+MODEL_GENERATIONS_IN_FLIGHT = Gauge(
+    "skyline_model_generations_in_flight",
+    "Models being generated or waiting for a worker.",
+)
+
+MODEL_GENERATIONS_REJECTED = Counter(
+    "skyline_model_generations_rejected",
+    "Model generations rejected because the pool was overloaded.",
+)
+
+MODEL_GENERATIONS_COALESCED = Counter(
+    "skyline_model_generations_coalesced",
+    "Model generations which waited for an identical generation already in flight.",
+)
+
+MODEL_PREGENERATIONS = Counter(
+    "skyline_model_pregenerations",
+    "Models considered for pre-generation after an import, by outcome.",
+    ["result"],
+)
+
+IMPORTS = Counter(
+    "skyline_imports",
+    "Years requested for import, by importer and result.",
+    ["importer", "result"],
+)
+
+GITHUB_RESPONSES = Counter(
+    "skyline_github_responses",
+    "Responses from the GitHub API, by status code.",
+    ["status_code"],
+)
+
+
+def observe_stages(operation: str, timings: StageTimings) -> None:
+    for stage, seconds in timings.durations.items():
+        STAGE_SECONDS.labels(operation, stage).observe(seconds)
+
+
+__all__ = [
+    "GITHUB_RESPONSES",
+    "IMPORTS",
+    "MODEL_CACHE_REQUESTS",
+    "MODEL_GENERATIONS_COALESCED",
+    "MODEL_GENERATIONS_IN_FLIGHT",
+    "MODEL_GENERATIONS_REJECTED",
+    "MODEL_PREGENERATIONS",
+    "STAGE_SECONDS",
+    "observe_stages",
+]
@@ -0,0 +1,39 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from skyline.metrics import observe_stages
+from skyline.timing import collect_stages
+
+
+class StageTimingMiddleware:
+    """Collects the stage timings of each request.
+
+    Timings are sent to the client in a `Server-Timing` header, and recorded in the
+    stage histogram under the name of the endpoint which handled the request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_stages() as timings:
+
+            async def send_with_timings(message: Message) -> None:
+                if message["type"] == "http.response.start" and timings.durations:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", timings.server_timing()
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timings)
+
+        endpoint = scope.get("endpoint")
+        if endpoint is not None and timings.durations:
+            observe_stages(endpoint.__name__, timings)
+
+
+__all__ = ["StageTimingMiddleware"]
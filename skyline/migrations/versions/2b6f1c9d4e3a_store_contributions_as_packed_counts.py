@@ -0,0 +1,113 @@
+"""Store contributions as packed counts
+
+Revision ID: 2b6f1c9d4e3a
+Revises: 6a8e39e07452
+Create Date: 2026-10-18 21:02:11.412087
+
+"""
+
+import json
+import sys
+from array import array
+from datetime import date, timedelta
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2b6f1c9d4e3a"
+down_revision: Union[str, None] = "6a8e39e07452"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+contribution_data = sa.table(
+    "contribution_data",
+    sa.column("user", sa.String()),
+    sa.column("year", sa.Integer()),
+    sa.column("importer", sa.String()),
+    sa.column("contributions", sa.String()),
+    sa.column("start_weekday", sa.Integer()),
+    sa.column("counts", sa.LargeBinary()),
+)
+
+
+def _pack(counts: list[int]) -> bytes:
+    packed = array("i", counts)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack(data: bytes) -> list[int]:
+    counts = array("i")
+    counts.frombytes(data)
+    if sys.byteorder == "big":
+        counts.byteswap()
+    return counts.tolist()
+
+
+def _key(row: sa.Row) -> sa.ColumnElement[bool]:
+    return sa.and_(
+        contribution_data.c.user == row.user,
+        contribution_data.c.year == row.year,
+        contribution_data.c.importer == row.importer,
+    )
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("contribution_data") as batch_op:
+        batch_op.add_column(sa.Column("start_weekday", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("counts", sa.LargeBinary(), nullable=True))
+
+    connection = op.get_bind()
+    for row in connection.execute(sa.select(contribution_data)).all():
+        contributions = sorted(
+            (date.fromisoformat(day), count)
+            for day, count in json.loads(row.contributions).items()
+        )
+        if not contributions:
+            # Nothing to convert, so drop the row and let the year be imported again
+            connection.execute(contribution_data.delete().where(_key(row)))
+            continue
+
+        connection.execute(
+            contribution_data.update()
+            .where(_key(row))
+            .values(
+                start_weekday=contributions[0][0].isoweekday() % 7,
+                counts=_pack([count for _, count in contributions]),
+            )
+        )
+
+    with op.batch_alter_table("contribution_data") as batch_op:
+        batch_op.alter_column("start_weekday", nullable=False)
+        batch_op.alter_column("counts", nullable=False)
+        batch_op.drop_column("contributions")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("contribution_data") as batch_op:
+        batch_op.add_column(sa.Column("contributions", sa.String(), nullable=True))
+
+    connection = op.get_bind()
+    for row in connection.execute(sa.select(contribution_data)).all():
+        # Imports always start on the 1st of January
+        first_day = date(row.year, 1, 1)
+        connection.execute(
+            contribution_data.update()
+            .where(_key(row))
+            .values(
+                contributions=json.dumps(
+                    {
+                        (first_day + timedelta(days=offset)).isoformat(): count
+                        for offset, count in enumerate(_unpack(row.counts))
+                    }
+                )
+            )
+        )
+
+    with op.batch_alter_table("contribution_data") as batch_op:
+        batch_op.alter_column("contributions", nullable=False)
+        batch_op.drop_column("counts")
+        batch_op.drop_column("start_weekday")
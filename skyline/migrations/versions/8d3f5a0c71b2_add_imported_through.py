@@ -0,0 +1,52 @@
+"""Add imported_through
+
+Revision ID: 8d3f5a0c71b2
+Revises: 2b6f1c9d4e3a
+Create Date: 2026-10-18 21:48:36.207519
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3f5a0c71b2"
+down_revision: Union[str, None] = "2b6f1c9d4e3a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+contribution_data = sa.table(
+    "contribution_data",
+    sa.column("year", sa.Integer()),
+    sa.column("imported_through", sa.Date()),
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("contribution_data") as batch_op:
+        batch_op.add_column(sa.Column("imported_through", sa.Date(), nullable=True))
+
+    # Only past years could be imported, so every existing year is complete
+    connection = op.get_bind()
+    years = (
+        connection.execute(sa.select(contribution_data.c.year).distinct())
+        .scalars()
+        .all()
+    )
+    for year in years:
+        connection.execute(
+            contribution_data.update()
+            .where(contribution_data.c.year == year)
+            .values(imported_through=date(year, 12, 31))
+        )
+
+    with op.batch_alter_table("contribution_data") as batch_op:
+        batch_op.alter_column("imported_through", nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("contribution_data") as batch_op:
+        batch_op.drop_column("imported_through")
@@ -0,0 +1,32 @@
+"""Add TaskLease
+
+Revision ID: c41e7b9a2d05
+Revises: 8d3f5a0c71b2
+Create Date: 2026-10-18 22:04:12.381946
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c41e7b9a2d05"
+down_revision: Union[str, None] = "8d3f5a0c71b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_lease",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("holder", sa.String(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_lease")
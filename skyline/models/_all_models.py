@@ -4,3 +4,4 @@
 # Should not be imported outside of skyline.migrations.env
 
 from .contribution_data import ContributionData  # type: ignore
+from .task_lease import TaskLease  # type: ignore
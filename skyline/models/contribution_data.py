@@ -1,13 +1,13 @@
+import sys
+from array import array
 from datetime import date
 from enum import Enum
+from typing import Sequence
 
-from pydantic import RootModel
 from sqlalchemy.orm import Mapped, mapped_column
 
 from skyline.db import Base
 
-Contributions = RootModel[dict[date, int]]
-
 
 class ContributionImporter(Enum):
     User = "user"
@@ -17,13 +17,48 @@ class ContributionImporter(Enum):
         return self.value
 
 
+def pack_counts(counts: Sequence[int]) -> bytes:
+    """Pack a year's daily contribution counts as little-endian 32-bit integers."""
+    packed = array("i", counts)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_counts(data: bytes) -> array[int]:
+    counts = array("i")
+    counts.frombytes(data)
+    if sys.byteorder == "big":
+        counts.byteswap()
+    return counts
+
+
 class ContributionData(Base):
     __tablename__ = "contribution_data"
 
     user: Mapped[str] = mapped_column(primary_key=True)
     year: Mapped[int] = mapped_column(primary_key=True)
     importer: Mapped[ContributionImporter] = mapped_column(primary_key=True)
-    contributions: Mapped[str]
+    # Weekday of the first day in `counts`, with Sunday as 0
+    start_weekday: Mapped[int]
+    # Contribution count for each day of the year, as packed by `pack_counts`
+    counts: Mapped[bytes]
+    # Last day whose contributions have been imported. Later days are still zero, and
+    # are fetched by refreshing the year.
+    imported_through: Mapped[date]
+
+    @property
+    def complete(self) -> bool:
+        return self.imported_through >= date(self.year, 12, 31)
+
+    @property
+    def days(self) -> array[int]:
+        return unpack_counts(self.counts)
 
 
-__all__ = ["Contributions", "ContributionData", "ContributionImporter"]
+__all__ = [
+    "ContributionData",
+    "ContributionImporter",
+    "pack_counts",
+    "unpack_counts",
+]
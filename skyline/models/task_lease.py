@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from skyline.db import Base
+
+
+class TaskLease(Base):
+    """Which process may run a periodic task, when several share the database."""
+
+    __tablename__ = "task_lease"
+
+    name: Mapped[str] = mapped_column(primary_key=True)
+    # Identifies the process holding the lease
+    holder: Mapped[str]
+    # In UTC. Once passed, any process may take over the lease.
+    expires_at: Mapped[datetime]
+
+
+__all__ = ["TaskLease"]
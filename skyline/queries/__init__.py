@@ -0,0 +1,20 @@
+from .contributions import (
+    YearContributions,
+    fetch_imported_rows,
+    fetch_incomplete_years,
+    fetch_year_contributions,
+    fetch_years_contributions,
+    upsert_contribution_data,
+)
+from .leases import acquire_lease, release_lease
+
+__all__ = [
+    "YearContributions",
+    "acquire_lease",
+    "fetch_imported_rows",
+    "fetch_incomplete_years",
+    "fetch_year_contributions",
+    "fetch_years_contributions",
+    "release_lease",
+    "upsert_contribution_data",
+]
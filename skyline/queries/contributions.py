@@ -0,0 +1,186 @@
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Iterable, Self, Sequence
+
+from sqlalchemy import extract, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from skyline.models.contribution_data import ContributionData, ContributionImporter
+from skyline.schemas.contributions import ModelContributionSelection
+
+
+@dataclass(frozen=True)
+class YearContributions:
+    """Decoded contributions from every importer for a single user and year."""
+
+    year: int
+    start_weekday: int
+    user_days: array[int]
+    bot_days: array[int]
+    user_counts: bytes
+    bot_counts: bytes
+    # The last day imported by both importers
+    imported_through: date
+
+    @classmethod
+    def from_rows(cls, user_data: ContributionData, bot_data: ContributionData) -> Self:
+        return cls(
+            year=bot_data.year,
+            start_weekday=bot_data.start_weekday,
+            user_days=user_data.days,
+            bot_days=bot_data.days,
+            user_counts=user_data.counts,
+            bot_counts=bot_data.counts,
+            imported_through=min(user_data.imported_through, bot_data.imported_through),
+        )
+
+    @property
+    def complete(self) -> bool:
+        return self.imported_through >= date(self.year, 12, 31)
+
+    @property
+    def _imported_days(self) -> int:
+        return (self.imported_through - date(self.year, 1, 1)).days + 1
+
+    @property
+    def work_available(self) -> bool:
+        # Both rows use the same packed layout, so the raw buffers can be compared
+        length = self._imported_days * self.bot_days.itemsize
+        return self.bot_counts[:length] != self.user_counts[:length]
+
+    def days(self, contribution_selection: ModelContributionSelection) -> list[int]:
+        match contribution_selection:
+            case ModelContributionSelection.All:
+                return self.bot_days.tolist()
+            case ModelContributionSelection.Personal:
+                return self.user_days.tolist()
+            case ModelContributionSelection.Work:
+                # Importers can be refreshed at different times, so only days both
+                # have imported can be compared
+                work = [bot - user for bot, user in zip(self.bot_days, self.user_days)]
+                imported_days = self._imported_days
+                return work[:imported_days] + [0] * (len(work) - imported_days)
+
+    def padded_days(
+        self, contribution_selection: ModelContributionSelection
+    ) -> list[int | None]:
+        # Pad the first week with None values to ensure the model is appropriately offset
+        return [None] * self.start_weekday + self.days(contribution_selection)
+
+
+async def _fetch_rows(
+    session: AsyncSession, user: str, years: Iterable[int]
+) -> Sequence[ContributionData]:
+    """Fetch every importer's rows for a user's years."""
+    return (
+        (
+            await session.execute(
+                select(ContributionData).filter(
+                    ContributionData.user == user,
+                    ContributionData.year.in_(list(years)),
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+
+async def fetch_years_contributions(
+    session: AsyncSession, user: str, years: Iterable[int]
+) -> dict[int, YearContributions]:
+    """Fetch the contributions for many years in a single query.
+
+    Years which have not been imported by every importer are omitted.
+    """
+    rows = await _fetch_rows(session, user, years)
+
+    rows_by_year: dict[int, dict[ContributionImporter, ContributionData]] = {}
+    for row in rows:
+        rows_by_year.setdefault(row.year, {})[row.importer] = row
+
+    return {
+        year: YearContributions.from_rows(
+            importers[ContributionImporter.User], importers[ContributionImporter.Bot]
+        )
+        for year, importers in rows_by_year.items()
+        if len(importers) == len(ContributionImporter)
+    }
+
+
+async def fetch_year_contributions(
+    session: AsyncSession, user: str, year: int
+) -> YearContributions | None:
+    return (await fetch_years_contributions(session, user, [year])).get(year)
+
+
+async def fetch_imported_rows(
+    session: AsyncSession, user: str, years: Sequence[int]
+) -> dict[tuple[int, ContributionImporter], ContributionData]:
+    """Fetch each importer's existing row for the given years."""
+    return {
+        (row.year, row.importer): row for row in await _fetch_rows(session, user, years)
+    }
+
+
+async def fetch_incomplete_years(
+    session: AsyncSession, importer: ContributionImporter
+) -> dict[str, list[int]]:
+    """Fetch every user's years which an importer hasn't imported through December 31st."""
+    rows = (
+        await session.execute(
+            select(ContributionData.user, ContributionData.year)
+            .filter(
+                ContributionData.importer == importer,
+                or_(
+                    extract("month", ContributionData.imported_through) != 12,
+                    extract("day", ContributionData.imported_through) != 31,
+                ),
+            )
+            .order_by(ContributionData.user, ContributionData.year)
+        )
+    ).all()
+
+    incomplete: dict[str, list[int]] = {}
+    for user, year in rows:
+        incomplete.setdefault(user, []).append(year)
+    return incomplete
+
+
+async def upsert_contribution_data(
+    session: AsyncSession, rows: Sequence[dict[str, Any]]
+) -> None:
+    """Insert contribution rows, or replace the counts of refreshed rows.
+
+    Rows are never replaced by counts imported through an earlier day, so concurrent
+    imports of the same year can't lose each other's days.
+    """
+    match session.bind.dialect.name:
+        case "postgresql":
+            statement = postgresql.insert(ContributionData).values(rows)
+        case _:
+            statement = sqlite.insert(ContributionData).values(rows)
+
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=["user", "year", "importer"],
+            set_={
+                "counts": statement.excluded.counts,
+                "imported_through": statement.excluded.imported_through,
+            },
+            where=ContributionData.imported_through
+            <= statement.excluded.imported_through,
+        )
+    )
+
+
+__all__ = [
+    "YearContributions",
+    "fetch_imported_rows",
+    "fetch_incomplete_years",
+    "fetch_year_contributions",
+    "fetch_years_contributions",
+    "upsert_contribution_data",
+]
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from skyline.models.task_lease import TaskLease
+
+
+def _utcnow() -> datetime:
+    # Stored without a time zone, as SQLite has no time zone aware type
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def acquire_lease(
+    session: AsyncSession, name: str, holder: str, duration: timedelta
+) -> bool:
+    """Take or renew a lease, unless another holder's lease hasn't expired yet."""
+    now = _utcnow()
+    values = {"name": name, "holder": holder, "expires_at": now + duration}
+
+    match session.bind.dialect.name:
+        case "postgresql":
+            statement = postgresql.insert(TaskLease).values(values)
+        case _:
+            statement = sqlite.insert(TaskLease).values(values)
+
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=["name"],
+            set_={
+                "holder": statement.excluded.holder,
+                "expires_at": statement.excluded.expires_at,
+            },
+            where=(TaskLease.holder == holder) | (TaskLease.expires_at < now),
+        )
+    )
+
+    current_holder = await session.scalar(
+        select(TaskLease.holder).filter(TaskLease.name == name)
+    )
+    return current_holder == holder
+
+
+async def release_lease(session: AsyncSession, name: str, holder: str) -> None:
+    """Give up a lease early, if it's still held, so another holder can take it."""
+    await session.execute(
+        delete(TaskLease).filter(TaskLease.name == name, TaskLease.holder == holder)
+    )
+
+
+__all__ = ["acquire_lease", "release_lease"]
@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import json
+import zipfile
+import zlib
+from typing import Any, AsyncIterator, Iterator
+
+import brotli
+from fastapi import Response, status
+from fastapi.responses import StreamingResponse
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Preferred encodings, in order of preference when the client weights them equally
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the best supported content encoding from an Accept-Encoding header."""
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    candidates = [
+        (weights.get(encoding, weights.get("*", 0.0)), -index, encoding)
+        for index, encoding in enumerate(SUPPORTED_ENCODINGS)
+    ]
+    weight, _, encoding = max(candidates)
+    return encoding if weight > 0 else None
+
+
+def representation_etag(key: str, encoding: str | None) -> str:
+    """Build a strong entity tag for one content encoding of a response."""
+    return f'"{key}-{encoding}"' if encoding else f'"{key}"'
+
+
+def json_etag(value: Any) -> str:
+    """Build a strong entity tag for a JSON response body."""
+    body = json.dumps(value, separators=(",", ":"), sort_keys=True)
+    return f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an entity tag, as a weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def not_modified_response(*, etag: str, cache_control: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        },
+    )
+
+
+def _chunks(body: bytes) -> Iterator[bytes]:
+    view = memoryview(body)
+    for offset in range(0, len(body), STREAM_CHUNK_SIZE):
+        yield bytes(view[offset : offset + STREAM_CHUNK_SIZE])
+
+
+def _gzip_chunks(body: bytes) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in _chunks(body):
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def _brotli_chunks(body: bytes) -> Iterator[bytes]:
+    compressor = brotli.Compressor(quality=5)
+    for chunk in _chunks(body):
+        if compressed := compressor.process(chunk):
+            yield compressed
+    yield compressor.finish()
+
+
+def model_response(
+    body: bytes,
+    *,
+    media_type: str,
+    filename: str,
+    accept_encoding: str | None,
+    etag_key: str | None = None,
+    cache_control: str | None = None,
+) -> StreamingResponse:
+    """Stream a generated model, compressed if the client supports it.
+
+    The chunk iterators are synchronous, so Starlette runs compression in its
+    threadpool rather than on the event loop.
+    """
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Vary": "Accept-Encoding",
+    }
+
+    encoding = negotiate_encoding(accept_encoding)
+    if etag_key is not None:
+        headers["ETag"] = representation_etag(etag_key, encoding)
+    if cache_control is not None:
+        headers["Cache-Control"] = cache_control
+
+    match encoding:
+        case "br":
+            content = _brotli_chunks(body)
+            headers["Content-Encoding"] = "br"
+        case "gzip":
+            content = _gzip_chunks(body)
+            headers["Content-Encoding"] = "gzip"
+        case _:
+            content = _chunks(body)
+            headers["Content-Length"] = str(len(body))
+
+    return StreamingResponse(content, media_type=media_type, headers=headers)
+
+
+class _ArchiveBuffer:
+    """An unseekable stream collecting what `ZipFile` writes until it's taken."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _archive_chunks(
+    entries: AsyncIterator[tuple[str, bytes]], compression: int
+) -> AsyncIterator[bytes]:
+    buffer = _ArchiveBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=compression) as archive:  # type: ignore - only needs write and flush
+        async for name, data in entries:
+            # Compression is CPU-bound, so keep it off the event loop
+            await asyncio.to_thread(archive.writestr, name, data)
+            yield buffer.take()
+    yield buffer.take()
+
+
+def archive_response(
+    entries: AsyncIterator[tuple[str, bytes]], *, filename: str, compress: bool
+) -> StreamingResponse:
+    """Stream files as a ZIP archive, adding each as soon as it's produced.
+
+    The archive is written without seeking, so only the file being added is ever held
+    in memory.
+    """
+    return StreamingResponse(
+        _archive_chunks(
+            entries, zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        ),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+__all__ = [
+    "archive_response",
+    "etag_matches",
+    "json_etag",
+    "model_response",
+    "negotiate_encoding",
+    "not_modified_response",
+    "representation_etag",
+]
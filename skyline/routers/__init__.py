@@ -1,4 +1,6 @@
+from .admin import admin_router
 from .auth import auth_router
 from .contributions import contributions_router
+from .metrics import metrics_router
 
-__all__ = ["auth_router", "contributions_router"]
+__all__ = ["admin_router", "auth_router", "contributions_router", "metrics_router"]
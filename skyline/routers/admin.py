@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, status
+
+from skyline.dependencies.auth import require_admin
+from skyline.schemas import ErrorResponseSchema
+from skyline.schemas.admin import RateLimitBudgetSchema
+from skyline.tasks.ratelimit import github_rate_limiter
+
+admin_router = APIRouter(tags=["Admin"])
+
+
+def _timestamp(value: float | None) -> datetime | None:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
+
+
+@admin_router.get(
+    "/rate-limits",
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Unauthenticated",
+            "model": ErrorResponseSchema,
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Not an admin",
+            "model": ErrorResponseSchema,
+        },
+    },
+)
+async def get_rate_limits(
+    _: str = Depends(require_admin),
+) -> list[RateLimitBudgetSchema]:
+    """Retrieve the current GitHub rate limit budget of every token in use."""
+    return [
+        RateLimitBudgetSchema(
+            key=key,
+            limit=budget.limit,
+            remaining=budget.remaining,
+            reset_at=_timestamp(budget.reset_at),
+            last_cost=budget.last_cost,
+            throttled_until=_timestamp(budget.throttled_until),
+        )
+        for key, budget in sorted(github_rate_limiter.budgets.items())
+    ]
+
+
+__all__ = ["admin_router"]
@@ -1,29 +1,100 @@
+import asyncio
+import base64
+import itertools
 from datetime import datetime, timezone
-from typing import Annotated, Any, Sequence
+from typing import Annotated, Any, AsyncIterator, Sequence
 
-from fastapi import APIRouter, Depends, Path, Query, Response, status
+from fastapi import APIRouter, Depends, Header, Path, Query, Response, status
 from fastapi.responses import JSONResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from skyline.cad.skyline import skyline_model
+from skyline.cad.cache import model_cache, model_cache_key
+from skyline.cad.formats import MEDIA_TYPES
+from skyline.cad.generation import model_label
+from skyline.cad.pool import ModelGenerationOverloaded, model_pool
+from skyline.cad.skyline import (
+    GRID_BASE_HEIGHT,
+    GRID_SQUARE_SIZE,
+    LABEL_DEPTH,
+    LABEL_FONT_SIZE,
+    SkylineLayout,
+)
+from skyline.config import config
 from skyline.dependencies.auth import require_token, require_user
-from skyline.dependencies.database import get_db
-from skyline.models.contribution_data import (
-    ContributionData,
-    ContributionImporter,
-    Contributions,
+from skyline.dependencies.database import get_read_db
+from skyline.metrics import MODEL_CACHE_REQUESTS
+from skyline.models.contribution_data import ContributionData, pack_counts
+from skyline.queries import (
+    YearContributions,
+    fetch_year_contributions,
+    fetch_years_contributions,
+)
+from skyline.responses import (
+    archive_response,
+    etag_matches,
+    json_etag,
+    model_response,
+    negotiate_encoding,
+    not_modified_response,
+    representation_etag,
 )
 from skyline.schemas import ErrorResponseSchema
-from skyline.schemas.contributions import ModelContributionSelection
-from skyline.tasks.importing import import_contributions
+from skyline.schemas.contributions import (
+    ImportJobSchema,
+    ModelArchiveRequestSchema,
+    ModelArchiveSpecSchema,
+    ModelContributionSelection,
+    ModelEngine,
+    ModelFormat,
+    ModelPreviewSchema,
+)
+from skyline.tasks.jobs import import_job_queue
+from skyline.timing import stage
 
 contributions_router = APIRouter(tags=["Contributions"])
 
+MAX_TILED_YEARS = 25
+MAX_ARCHIVE_MODELS = 150
+# Times each archived model is attempted while model generation is overloaded, before
+# an error is archived in its place
+ARCHIVE_GENERATION_ATTEMPTS = 5
+ARCHIVE_OVERLOADED_ERROR = (
+    b"Model generation was overloaded, so this model couldn't be generated. "
+    b"Please try again later.\n"
+)
+
+
+def _overloaded_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=ErrorResponseSchema(
+            detail="Too many models are being generated. Try again shortly."
+        ).model_dump(),
+        headers={"Retry-After": str(config.model_retry_after_seconds)},
+    )
+
+
+def _cache_control(*contributions: YearContributions | None) -> str:
+    # Responses are per-user, so shared caches must never store them
+    if all(year is not None and year.complete for year in contributions):
+        # Fully imported years never change
+        return f"private, max-age={config.immutable_max_age_seconds}, immutable"
+    return "private, no-cache"
+
+
+def _unsupported_labels_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content=ErrorResponseSchema(
+            detail="Labels are not supported by the mesh engine."
+        ).model_dump(),
+    )
+
 
 @contributions_router.post(
     "/import/{year}",
-    status_code=status.HTTP_204_NO_CONTENT,
+    status_code=status.HTTP_202_ACCEPTED,
     responses={
         status.HTTP_400_BAD_REQUEST: {
             "description": "Invalid Year",
@@ -33,170 +104,609 @@ contributions_router = APIRouter(tags=["Contributions"])
             "description": "Unauthenticated",
             "model": ErrorResponseSchema,
         },
-        status.HTTP_409_CONFLICT: {
-            "description": "Contributions Already Imported",
-            "model": ErrorResponseSchema,
-        },
     },
 )
 async def start_import(
     year: Annotated[int, Path(description="The year to import contributions for.")],
     user: str = Depends(require_user),
     token: Any = Depends(require_token),
-    db: AsyncSession = Depends(get_db),
-):
-    """Import contributions for the current user."""
+) -> ImportJobSchema:
+    """Start importing contributions for the current user.
+
+    The import runs in the background; poll the returned job for its status. Importing
+    a year which is already imported fetches any days since it was last imported.
+    """
 
-    if year >= datetime.now(timezone.utc).year or year < 2005:
+    if year > datetime.now(timezone.utc).year or year < 2005:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content=ErrorResponseSchema(
-                detail="Invalid year. Year must be greater than or equal to 2005, and less than the current year."
+                detail="Invalid year. Year must be greater than or equal to 2005, and no later than the current year."
             ).model_dump(),
         )
 
-    async with db.begin():
-        is_imported = (
-            await db.execute(
-                select(ContributionData).filter_by(user=user, year=year).limit(1)
-            )
-        ).scalar_one_or_none()
-        if is_imported:
-            return JSONResponse(
-                status_code=status.HTTP_409_CONFLICT,
-                content=ErrorResponseSchema(
-                    detail="Contributions already imported."
-                ).model_dump(),
-            )
+    return import_job_queue.submit(user, [year], token).to_schema()
+
+
+@contributions_router.post(
+    "/import/{start_year}/{end_year}",
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Invalid Year Range",
+            "model": ErrorResponseSchema,
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Unauthenticated",
+            "model": ErrorResponseSchema,
+        },
+    },
+)
+async def start_bulk_import(
+    start_year: Annotated[
+        int, Path(description="The first year to import contributions for.")
+    ],
+    end_year: Annotated[
+        int, Path(description="The last year to import contributions for.")
+    ],
+    user: str = Depends(require_user),
+    token: Any = Depends(require_token),
+) -> ImportJobSchema:
+    """Start importing contributions for a range of years for the current user.
+
+    The import runs in the background; poll the returned job for its status. Years
+    which have already been fully imported are skipped, and others only fetch the days
+    since they were last imported.
+    """
 
-    await import_contributions(user, year, token, db)
+    if (
+        end_year < start_year
+        or end_year > datetime.now(timezone.utc).year
+        or start_year < 2005
+    ):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content=ErrorResponseSchema(
+                detail="Invalid year range. Years must be greater than or equal to 2005, and no later than the current year."
+            ).model_dump(),
+        )
 
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return import_job_queue.submit(
+        user, list(range(start_year, end_year + 1)), token
+    ).to_schema()
 
 
-@contributions_router.get("/model/{year}")
+@contributions_router.get(
+    "/import-jobs/{job_id}",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Job Not Found",
+            "model": ErrorResponseSchema,
+        },
+    },
+)
+async def get_import_job(
+    job_id: Annotated[str, Path(description="The ID of the import job.")],
+    user: str = Depends(require_user),
+) -> ImportJobSchema:
+    """Retrieve the status of an import job."""
+    job = import_job_queue.get(job_id)
+    if job is None or job.user != user:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content=ErrorResponseSchema(detail="Import job not found.").model_dump(),
+        )
+
+    return job.to_schema()
+
+
+@contributions_router.get(
+    "/model/{year}",
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Unsupported Options",
+            "model": ErrorResponseSchema,
+        },
+        status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Model Generation Overloaded",
+            "model": ErrorResponseSchema,
+        },
+    },
+)
 async def get_model(
     year: int,
     user: str = Depends(require_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     contribution_selection: Annotated[
         ModelContributionSelection, Query(alias="contributions")
     ] = ModelContributionSelection.All,
     include_labels: bool = False,
+    engine: Annotated[
+        ModelEngine,
+        Query(
+            description="The engine used to generate the model. The mesh engine is much faster, but does not support labels. The merged CadQuery engine combines neighbouring days with equal counts, producing far fewer faces."
+        ),
+    ] = ModelEngine.CadQuery,
+    model_format: Annotated[
+        ModelFormat,
+        Query(
+            alias="format",
+            description="The file format of the model. 3MF and GLB store each vertex once, so are much smaller than STL.",
+        ),
+    ] = ModelFormat.STL,
+    accept_encoding: Annotated[str | None, Header(include_in_schema=False)] = None,
+    if_none_match: Annotated[str | None, Header(include_in_schema=False)] = None,
 ):
     """Retrieve the contributions model for a given user and year."""
-    async with db.begin():
-        user_contribution_data = (
-            await db.execute(
-                select(ContributionData).filter_by(
-                    user=user, year=year, importer=ContributionImporter.User
-                )
-            )
-        ).scalar_one_or_none()
-        bot_contribution_data = (
-            await db.execute(
-                select(ContributionData).filter_by(
-                    user=user, year=year, importer=ContributionImporter.Bot
-                )
-            )
-        ).scalar_one_or_none()
+    if engine == ModelEngine.Mesh and include_labels:
+        return _unsupported_labels_response()
+
+    with stage("db_fetch"):
+        async with db.begin():
+            contributions = await fetch_year_contributions(db, user, year)
 
-    if not user_contribution_data or not bot_contribution_data:
+    if contributions is None:
         return Response(status_code=status.HTTP_404_NOT_FOUND)
 
-    user_contributions = Contributions.model_validate_json(
-        user_contribution_data.contributions
+    with stage("decode"):
+        days = contributions.padded_days(contribution_selection)
+
+    label = (
+        model_label(user, str(year), contribution_selection) if include_labels else None
     )
-    bot_contributions = Contributions.model_validate_json(
-        bot_contribution_data.contributions
+    cache_key = model_cache_key(
+        days=days,
+        label=label,
+        include_month_label=include_labels,
+        contribution_selection=contribution_selection.value,
+        engine=engine.value,
+        model_format=model_format.value,
     )
 
-    contributions = {}
-
-    match contribution_selection:
-        case ModelContributionSelection.All:
-            contributions = bot_contributions.root
-        case ModelContributionSelection.Personal:
-            contributions = user_contributions.root
-        case ModelContributionSelection.Work:
-            for day in bot_contributions.root:
-                contributions[day] = (
-                    bot_contributions.root[day] - user_contributions.root[day]
+    # Checked before the cache, so unchanged models are never read or generated
+    cache_control = _cache_control(contributions)
+    etag = representation_etag(cache_key, negotiate_encoding(accept_encoding))
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag=etag, cache_control=cache_control)
+
+    with stage("cache_lookup"):
+        model = await model_cache.get(user, year, cache_key)
+
+    MODEL_CACHE_REQUESTS.labels("miss" if model is None else "hit").inc()
+    if model is None:
+        try:
+            # Includes waiting for a worker, on top of the worker's own stages
+            with stage("generate"):
+                model = await model_pool.generate(
+                    key=cache_key,
+                    engine=engine,
+                    days=days,
+                    label=label,
+                    include_month_label=include_labels,
+                    model_format=model_format,
                 )
+        except ModelGenerationOverloaded:
+            return _overloaded_response()
 
-    days = list(contributions.values())
+        with stage("cache_store"):
+            await model_cache.put(user, year, cache_key, model)
 
-    # Pad the first week with None values to ensure the model is appropriately offset
-    first_day = list(contributions.keys())[0]
-    weekday_number = first_day.isoweekday()
-    missing_days = weekday_number % 7
-    days = [None] * missing_days + days
+    return model_response(
+        model,
+        media_type=MEDIA_TYPES[model_format],
+        filename=f"{user}-{year}.{model_format.value}",
+        accept_encoding=accept_encoding,
+        etag_key=cache_key,
+        cache_control=cache_control,
+    )
 
-    model = skyline_model(
-        days=days,
-        label=f"{user}\n{year} - {contribution_selection.value.capitalize()} Contributions"
+
+@contributions_router.get(
+    "/preview/{year}",
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"},
+        status.HTTP_404_NOT_FOUND: {"description": "Year Not Imported"},
+    },
+)
+async def get_model_preview(
+    year: int,
+    response: Response,
+    user: str = Depends(require_user),
+    db: AsyncSession = Depends(get_read_db),
+    contribution_selection: Annotated[
+        ModelContributionSelection, Query(alias="contributions")
+    ] = ModelContributionSelection.All,
+    include_labels: bool = False,
+    if_none_match: Annotated[str | None, Header(include_in_schema=False)] = None,
+) -> ModelPreviewSchema:
+    """Retrieve the layout of a model, so it can be previewed without generating it."""
+    async with db.begin():
+        contributions = await fetch_year_contributions(db, user, year)
+
+    if contributions is None:
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+
+    days = contributions.padded_days(contribution_selection)
+    layout = SkylineLayout.from_days(days)
+
+    preview = ModelPreviewSchema(
+        days=base64.b64encode(
+            pack_counts([-1 if count is None else count for count in days])
+        ).decode(),
+        cols=layout.cols,
+        first_day_row=layout.first_day_row,
+        last_day_row=layout.last_day_row,
+        center_row_offset=layout.center_row_offset,
+        center_col_offset=layout.center_col_offset,
+        grid_square_size=GRID_SQUARE_SIZE,
+        grid_base_height=GRID_BASE_HEIGHT,
+        label=(
+            model_label(user, str(year), contribution_selection)
+            if include_labels
+            else None
+        ),
+        include_month_label=include_labels,
+        label_font_size=LABEL_FONT_SIZE,
+        label_depth=LABEL_DEPTH,
+    )
+
+    etag = json_etag(preview.model_dump())
+    cache_control = _cache_control(contributions)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag=etag, cache_control=cache_control)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return preview
+
+
+@contributions_router.get(
+    "/model/{start_year}/{end_year}",
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Invalid Year Range or Unsupported Options",
+            "model": ErrorResponseSchema,
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Years Not Imported",
+            "model": ErrorResponseSchema,
+        },
+        status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Model Generation Overloaded",
+            "model": ErrorResponseSchema,
+        },
+    },
+)
+async def get_tiled_model(
+    start_year: int,
+    end_year: int,
+    user: str = Depends(require_user),
+    db: AsyncSession = Depends(get_read_db),
+    contribution_selection: Annotated[
+        ModelContributionSelection, Query(alias="contributions")
+    ] = ModelContributionSelection.All,
+    include_labels: bool = False,
+    engine: Annotated[
+        ModelEngine,
+        Query(
+            description="The engine used to generate the model. The mesh engine is much faster, but does not support labels. The merged CadQuery engine combines neighbouring days with equal counts, producing far fewer faces."
+        ),
+    ] = ModelEngine.CadQuery,
+    model_format: Annotated[
+        ModelFormat,
+        Query(
+            alias="format",
+            description="The file format of the model. 3MF and GLB store each vertex once, so are much smaller than STL.",
+        ),
+    ] = ModelFormat.STL,
+    accept_encoding: Annotated[str | None, Header(include_in_schema=False)] = None,
+    if_none_match: Annotated[str | None, Header(include_in_schema=False)] = None,
+):
+    """Retrieve a single model of a range of years, tiled side by side."""
+    if (
+        end_year < start_year
+        or end_year > datetime.now(timezone.utc).year
+        or start_year < 2005
+    ):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content=ErrorResponseSchema(
+                detail="Invalid year range. Years must be greater than or equal to 2005, and no later than the current year."
+            ).model_dump(),
+        )
+
+    if end_year - start_year >= MAX_TILED_YEARS:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content=ErrorResponseSchema(
+                detail=f"Invalid year range. At most {MAX_TILED_YEARS} years may be tiled."
+            ).model_dump(),
+        )
+
+    if engine == ModelEngine.Mesh and include_labels:
+        return _unsupported_labels_response()
+
+    years = range(start_year, end_year + 1)
+
+    with stage("db_fetch"):
+        async with db.begin():
+            contributions = await fetch_years_contributions(db, user, years)
+
+    missing_years = [year for year in years if year not in contributions]
+    if missing_years:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content=ErrorResponseSchema(
+                detail=f"Contributions not imported for: {', '.join(map(str, missing_years))}."
+            ).model_dump(),
+        )
+
+    # Each year's first week is padded by exactly the length of the previous year's
+    # last week, so consecutive years form one continuous grid with a single base
+    with stage("decode"):
+        days = contributions[start_year].padded_days(contribution_selection)
+        for year in years[1:]:
+            days += contributions[year].days(contribution_selection)
+
+    label = (
+        model_label(user, f"{start_year}-{end_year}", contribution_selection)
         if include_labels
-        else None,
+        else None
+    )
+    etag_key = model_cache_key(
+        days=days,
+        label=label,
         include_month_label=include_labels,
+        contribution_selection=contribution_selection.value,
+        engine=engine.value,
+        model_format=model_format.value,
     )
+    cache_control = _cache_control(*contributions.values())
+    etag = representation_etag(etag_key, negotiate_encoding(accept_encoding))
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag=etag, cache_control=cache_control)
 
-    return Response(
+    try:
+        with stage("generate"):
+            model = await model_pool.generate(
+                key=etag_key,
+                engine=engine,
+                days=days,
+                label=label,
+                include_month_label=include_labels,
+                model_format=model_format,
+            )
+    except ModelGenerationOverloaded:
+        return _overloaded_response()
+
+    return model_response(
         model,
-        headers={
-            "Content-Type": "model/stl",
-            "Content-Disposition": f"attachment; filename={user}-{year}.stl",
+        media_type=MEDIA_TYPES[model_format],
+        filename=f"{user}-{start_year}-{end_year}.{model_format.value}",
+        accept_encoding=accept_encoding,
+        etag_key=etag_key,
+        cache_control=cache_control,
+    )
+
+
+async def _archive_models(
+    user: str,
+    specs: Sequence[ModelArchiveSpecSchema],
+    contributions: dict[int, YearContributions],
+    engine: ModelEngine,
+    model_format: ModelFormat,
+) -> AsyncIterator[tuple[str, bytes]]:
+    """Generate models in parallel, yielding each with its filename once ready.
+
+    Only a few models are built ahead of the archive being written, so a slow client
+    never leaves every model held in memory at once.
+    """
+    # Generate on at most half the workers at once, so an archive never fills the queue
+    # and leaves room for other requests
+    concurrency = max(1, model_pool.workers // 2)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def build(spec: ModelArchiveSpecSchema) -> tuple[str, bytes]:
+        days = contributions[spec.year].padded_days(spec.contribution_selection)
+        label = (
+            model_label(user, str(spec.year), spec.contribution_selection)
+            if spec.include_labels
+            else None
+        )
+        cache_key = model_cache_key(
+            days=days,
+            label=label,
+            include_month_label=spec.include_labels,
+            contribution_selection=spec.contribution_selection.value,
+            engine=engine.value,
+            model_format=model_format.value,
+        )
+        suffix = "-labelled" if spec.include_labels else ""
+        filename = f"{user}-{spec.year}-{spec.contribution_selection.value}{suffix}.{model_format.value}"
+
+        model = await model_cache.get(user, spec.year, cache_key)
+        MODEL_CACHE_REQUESTS.labels("miss" if model is None else "hit").inc()
+        attempts = 0
+        while model is None:
+            try:
+                async with semaphore:
+                    model = await model_pool.generate(
+                        key=cache_key,
+                        engine=engine,
+                        days=days,
+                        label=label,
+                        include_month_label=spec.include_labels,
+                        model_format=model_format,
+                    )
+                await model_cache.put(user, spec.year, cache_key, model)
+            except ModelGenerationOverloaded:
+                attempts += 1
+                # The archive is already being streamed, so the error can only be
+                # reported inside it
+                if attempts == ARCHIVE_GENERATION_ATTEMPTS:
+                    return f"{filename}.error.txt", ARCHIVE_OVERLOADED_ERROR
+
+                await asyncio.sleep(config.model_retry_after_seconds)
+
+        return filename, model
+
+    # Enough to keep generating while finished models are written
+    ahead = 2 * concurrency
+    remaining = iter(specs)
+    tasks: set[asyncio.Task[tuple[str, bytes]]] = set()
+    try:
+        while True:
+            # Only start more once earlier models have been written
+            for spec in itertools.islice(remaining, ahead - len(tasks)):
+                tasks.add(asyncio.create_task(build(spec)))
+            if not tasks:
+                break
+
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@contributions_router.post(
+    "/model-archive",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "A ZIP archive of the models",
+            "content": {"application/zip": {}},
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Too Many Models or Unsupported Options",
+            "model": ErrorResponseSchema,
         },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Years Not Imported",
+            "model": ErrorResponseSchema,
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Model Generation Overloaded",
+            "model": ErrorResponseSchema,
+        },
+    },
+)
+async def get_model_archive(
+    archive: ModelArchiveRequestSchema,
+    user: str = Depends(require_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Retrieve many models at once, as a ZIP archive.
+
+    Models are generated in parallel, and each is streamed as soon as it's ready. If
+    model generation stays overloaded, a model is replaced by a `.error.txt` file.
+    """
+    specs = list(dict.fromkeys(archive.models))
+    if not specs or len(specs) > MAX_ARCHIVE_MODELS:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content=ErrorResponseSchema(
+                detail=f"Invalid models. Between 1 and {MAX_ARCHIVE_MODELS} models may be archived at once."
+            ).model_dump(),
+        )
+
+    if archive.engine == ModelEngine.Mesh and any(
+        spec.include_labels for spec in specs
+    ):
+        return _unsupported_labels_response()
+
+    # Checked up front, as errors can't be reported once the archive is streaming
+    if model_pool.in_flight >= model_pool.workers + model_pool.queue_depth:
+        return _overloaded_response()
+
+    years = sorted({spec.year for spec in specs})
+
+    with stage("db_fetch"):
+        async with db.begin():
+            contributions = await fetch_years_contributions(db, user, years)
+
+    missing_years = [year for year in years if year not in contributions]
+    if missing_years:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content=ErrorResponseSchema(
+                detail=f"Contributions not imported for: {', '.join(map(str, missing_years))}."
+            ).model_dump(),
+        )
+
+    return archive_response(
+        _archive_models(
+            user, specs, contributions, archive.engine, archive.output_format
+        ),
+        filename=f"{user}-models.zip",
+        # 3MF files are already ZIP archives themselves
+        compress=archive.output_format != ModelFormat.ThreeMF,
     )
 
 
-@contributions_router.get("/years")
+@contributions_router.get(
+    "/years",
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
+)
 async def get_years(
+    response: Response,
     user: str = Depends(require_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    if_none_match: Annotated[str | None, Header(include_in_schema=False)] = None,
 ) -> Sequence[int]:
     """Get a list of years for which contributions have been imported."""
     async with db.begin():
         years = (
             (
                 await db.execute(
-                    select(ContributionData.year).filter_by(user=user).distinct()
+                    select(ContributionData.year)
+                    .filter_by(user=user)
+                    .distinct()
+                    .order_by(ContributionData.year)
                 )
             )
             .scalars()
             .all()
         )
 
+    # Importing another year changes the list, so it must always be revalidated
+    etag = json_etag(list(years))
+    cache_control = "private, no-cache"
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag=etag, cache_control=cache_control)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
     return years
 
 
-@contributions_router.get("/work-contributions-available/{year}")
+@contributions_router.get(
+    "/work-contributions-available/{year}",
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
+)
 async def work_contributions_available(
-    year: int, user: str = Depends(require_user), db: AsyncSession = Depends(get_db)
+    year: int,
+    response: Response,
+    user: str = Depends(require_user),
+    db: AsyncSession = Depends(get_read_db),
+    if_none_match: Annotated[str | None, Header(include_in_schema=False)] = None,
 ) -> bool:
     """Get whether or not work contributions are available for the user for."""
     async with db.begin():
-        user_contribution_data = (
-            await db.execute(
-                select(ContributionData).filter_by(
-                    user=user, year=year, importer=ContributionImporter.User
-                )
-            )
-        ).scalar_one_or_none()
-        bot_contribution_data = (
-            await db.execute(
-                select(ContributionData).filter_by(
-                    user=user, year=year, importer=ContributionImporter.Bot
-                )
-            )
-        ).scalar_one_or_none()
+        contributions = await fetch_year_contributions(db, user, year)
 
-    if not user_contribution_data or not bot_contribution_data:
-        return False
+    available = contributions is not None and contributions.work_available
 
-    return (
-        Contributions.model_validate_json(bot_contribution_data.contributions).root
-        != Contributions.model_validate_json(user_contribution_data.contributions).root
-    )
+    etag = json_etag(available)
+    cache_control = _cache_control(contributions)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag=etag, cache_control=cache_control)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return available
 
 
 __all__ = ["contributions_router"]
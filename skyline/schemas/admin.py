@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class RateLimitBudgetSchema(BaseModel):
+    """The last known GitHub rate limit budget of a token."""
+
+    key: str = Field(
+        description="The token the budget belongs to. Either `machine` for the machine user, or `user:<login>` for a user's OAuth token."
+    )
+    limit: int | None = Field(
+        description="The number of points available per rate limit window, if known."
+    )
+    remaining: int | None = Field(
+        description="The number of points remaining in the current window, if known."
+    )
+    reset_at: datetime | None = Field(
+        description="When the current window resets, if known."
+    )
+    last_cost: int = Field(description="The cost of the most recent query.")
+    throttled_until: datetime | None = Field(
+        description="When requests will resume after being rate limited, if they currently are."
+    )
+
+
+__all__ = ["RateLimitBudgetSchema"]
@@ -1,7 +1,107 @@
 from enum import Enum
 
+from pydantic import BaseModel, ConfigDict, Field
+
 
 class ModelContributionSelection(Enum):
     All = "all"
     Personal = "personal"
     Work = "work"
+
+
+class ModelEngine(Enum):
+    CadQuery = "cadquery"
+    CadQueryMerged = "cadquery-merged"
+    Mesh = "mesh"
+
+
+class ModelFormat(Enum):
+    STL = "stl"
+    ThreeMF = "3mf"
+    GLB = "glb"
+
+
+class ImportJobStatus(Enum):
+    Queued = "queued"
+    Running = "running"
+    Succeeded = "succeeded"
+    Failed = "failed"
+
+
+class ImportJobSchema(BaseModel):
+    """A background job importing contributions."""
+
+    id: str = Field(description="The ID of the job, used to poll its status.")
+    status: ImportJobStatus = Field(description="The current status of the job.")
+    years: list[int] = Field(description="The years the job is importing.")
+    imported_years: list[int] = Field(
+        description="The years which were imported, once the job has succeeded. Years which had already been imported are not included."
+    )
+    error: str | None = Field(description="Why the job failed, if it did.")
+
+
+class ModelArchiveSpecSchema(BaseModel):
+    """One model to include in an archive."""
+
+    model_config = ConfigDict(frozen=True)
+
+    year: int = Field(description="The year to generate a model of.")
+    contribution_selection: ModelContributionSelection = Field(
+        default=ModelContributionSelection.All,
+        alias="contributions",
+        description="Which contributions to include in the model.",
+    )
+    include_labels: bool = Field(
+        default=False,
+        description="Whether to engrave the user, year and months into the base.",
+    )
+
+
+class ModelArchiveRequestSchema(BaseModel):
+    """A set of models to generate and download as a single ZIP archive."""
+
+    models: list[ModelArchiveSpecSchema] = Field(
+        description="The models to include. Duplicates are only included once."
+    )
+    engine: ModelEngine = Field(
+        default=ModelEngine.CadQuery,
+        description="The engine used to generate every model. The mesh engine does not support labels.",
+    )
+    output_format: ModelFormat = Field(
+        default=ModelFormat.STL,
+        alias="format",
+        description="The file format of every model.",
+    )
+
+
+class ModelPreviewSchema(BaseModel):
+    """Everything needed to render a preview of a model, without generating it."""
+
+    days: str = Field(
+        description="The contribution count of each grid square, as base64-encoded little-endian 32-bit integers. The grid is filled column by column, with 7 rows per column, and -1 marks padding before the first day of the year."
+    )
+    cols: int = Field(
+        description="The number of full columns. The last column may be partial."
+    )
+    first_day_row: int = Field(description="The row of the first day of the year.")
+    last_day_row: int = Field(
+        description="The row of the last day of the year within the partial column after the full columns, or -1 if there is no partial column."
+    )
+    center_row_offset: float = Field(
+        description="The offset applied to every row position to centre the model."
+    )
+    center_col_offset: float = Field(
+        description="The offset applied to every column position to centre the model."
+    )
+    grid_square_size: float = Field(description="The width of each grid square.")
+    grid_base_height: float = Field(
+        description="The height of the base, which every column stands on."
+    )
+    label: str | None = Field(
+        description="The text engraved into the underside of the model, if any."
+    )
+    include_month_label: bool = Field(
+        description="Whether the first and last months are engraved into the underside of the model."
+    )
+    label_font_size: float = Field(description="The font size of engraved labels.")
+    label_depth: float = Field(description="How deep labels are engraved.")
@@ -0,0 +1,17 @@
+import httpx
+
+from skyline.config import config
+
+# Shared for the lifetime of the application, so requests to GitHub reuse pooled
+# (and HTTP/2 multiplexed) connections rather than each paying for a new handshake
+github_client = httpx.AsyncClient(
+    base_url=config.github_api_url,
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=config.github_max_connections,
+        max_keepalive_connections=config.github_max_connections,
+    ),
+    timeout=config.github_timeout_seconds,
+)
+
+__all__ = ["github_client"]
@@ -1,163 +1,331 @@
-from datetime import date
-from typing import Any, Awaitable, Callable, cast
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Awaitable, Callable, Self, Sequence
 
 import httpx
 import structlog
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from skyline.cad.cache import model_cache
 from skyline.config import config
-from skyline.dependencies.auth import oauth
+from skyline.metrics import GITHUB_RESPONSES, IMPORTS
 from skyline.models.contribution_data import (
     ContributionData,
     ContributionImporter,
-    Contributions,
+    pack_counts,
+    unpack_counts,
 )
+from skyline.queries import fetch_imported_rows, upsert_contribution_data
+from skyline.timing import stage
 
-from .importing_models import ContributionsQueryResponse
+from .github import github_client
+from .importing_models import (
+    ContributionsQueryContributionCollection,
+    ContributionsQueryResponse,
+)
+from .ratelimit import MACHINE_USER_KEY, github_rate_limiter, oauth_key
 
 logger = structlog.get_logger()
 
-CONTRIBUTIONS_QUERY = """
-query ($user: String!, $start: DateTime!, $end: DateTime!) {
-    user(login: $user) {
-        contributionsCollection(from: $start, to: $end) {
-            contributionCalendar {
-                weeks {
-                    contributionDays {
-                        date
-                        contributionCount
-                    }
-                }
+CONTRIBUTIONS_QUERY_TEMPLATE = """
+fragment ContributionDays on ContributionsCollection {
+    contributionCalendar {
+        weeks {
+            contributionDays {
+                date
+                contributionCount
             }
         }
     }
 }
+
+query ($user: String!) {
+    user(login: $user) {
+%s
+    }
+    rateLimit {
+        cost
+        remaining
+        resetAt
+    }
+}
 """
 
-type ContributionQuerier = Callable[[str, int], Awaitable[ContributionsQueryResponse]]
 
+@dataclass(frozen=True)
+class ImportWindow:
+    """An inclusive range of days within a single year to fetch contributions for."""
+
+    year: int
+    start: date
+    end: date
+
+    @classmethod
+    def for_row(
+        cls, year: int, existing: ContributionData | None, today: date
+    ) -> Self | None:
+        """Get the days still to fetch for a year, or None if it's fully imported.
+
+        The last imported day is fetched again, as it may not have been over when it
+        was imported.
+        """
+        end = min(date(year, 12, 31), today)
+        if existing is None:
+            return cls(year, date(year, 1, 1), end)
+        if existing.complete:
+            return None
+        return cls(year, existing.imported_through, end)
+
+
+type ContributionQuerier = Callable[
+    [str, Sequence[ImportWindow]],
+    Awaitable[dict[int, ContributionsQueryContributionCollection]],
+]
+
+
+def contributions_query(windows: Sequence[ImportWindow]) -> str:
+    """Build a query fetching each window's contributions under a `y<year>` alias."""
+    collections = "\n".join(
+        f'        y{window.year}: contributionsCollection(from: "{window.start.isoformat()}T00:00:00Z", to: "{window.end.isoformat()}T23:59:59Z") {{ ...ContributionDays }}'
+        for window in windows
+    )
+    return CONTRIBUTIONS_QUERY_TEMPLATE % collections
 
-async def bot_contribution_querier(user: str, year: int) -> ContributionsQueryResponse:
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            "https://api.github.com/graphql",
+
+async def query_contributions(
+    user: str, windows: Sequence[ImportWindow], access_token: str, rate_limit_key: str
+) -> dict[int, ContributionsQueryContributionCollection]:
+    if not windows:
+        return {}
+
+    async def send() -> httpx.Response:
+        resp = await github_client.post(
+            "/graphql",
             json={
-                "query": CONTRIBUTIONS_QUERY,
-                "variables": {
-                    "user": user,
-                    "start": f"{year}-01-01T00:00:00Z",
-                    "end": f"{year}-12-31T23:59:59Z",
-                },
+                "query": contributions_query(windows),
+                "variables": {"user": user},
             },
-            headers={"Authorization": f"Bearer {config.github_machine_user_pat}"},
+            headers={"Authorization": f"Bearer {access_token}"},
         )
+        GITHUB_RESPONSES.labels(str(resp.status_code)).inc()
+        return resp
 
+    with stage("github"):
+        resp = await github_rate_limiter.request(rate_limit_key, send)
     resp.raise_for_status()
-    return ContributionsQueryResponse.model_validate(resp.json())
+
+    with stage("decode"):
+        data = ContributionsQueryResponse.model_validate(resp.json())
+    if (rate_limit := data.data.rate_limit) is not None:
+        github_rate_limiter.record_cost(
+            rate_limit_key, rate_limit.cost, rate_limit.remaining, rate_limit.reset_at
+        )
+    return {int(alias[1:]): collection for alias, collection in data.data.user.items()}
+
+
+async def bot_contribution_querier(
+    user: str, windows: Sequence[ImportWindow]
+) -> dict[int, ContributionsQueryContributionCollection]:
+    return await query_contributions(
+        user, windows, config.github_machine_user_pat, MACHINE_USER_KEY
+    )
 
 
 def oauth_contribution_querier(token: Any) -> ContributionQuerier:
     async def _contribution_querier(
         user: str,
-        year: int,
-    ) -> ContributionsQueryResponse:
-        resp = cast(
-            httpx.Response,
-            await oauth.github.post(
-                "/graphql",
-                json={
-                    "query": CONTRIBUTIONS_QUERY,
-                    "variables": {
-                        "user": user,
-                        "start": f"{year}-01-01T00:00:00Z",
-                        "end": f"{year}-12-31T23:59:59Z",
-                    },
-                },
-                token=token,
-            ),
+        windows: Sequence[ImportWindow],
+    ) -> dict[int, ContributionsQueryContributionCollection]:
+        return await query_contributions(
+            user, windows, token["access_token"], oauth_key(user)
         )
-        resp.raise_for_status()
-
-        return ContributionsQueryResponse.model_validate(resp.json())
 
     return _contribution_querier
 
 
-async def import_year(
+def contribution_data_values(
     user: str,
-    year: int,
+    window: ImportWindow,
     importer: ContributionImporter,
+    collection: ContributionsQueryContributionCollection,
+    existing: ContributionData | None,
+) -> dict[str, Any]:
+    """Merge a window's contributions into a year's counts.
+
+    Counts always cover the whole year, with days not yet imported left as zero.
+    """
+    first_day = date(window.year, 1, 1)
+    if existing is None:
+        counts = [0] * (date(window.year + 1, 1, 1) - first_day).days
+    else:
+        counts = existing.days.tolist()
+
+    for week in collection.contribution_calendar.weeks:
+        for day in week.contribution_days:
+            if window.start <= day.date <= window.end:
+                counts[(day.date - first_day).days] = day.contribution_count
+
+    return {
+        "user": user,
+        "year": window.year,
+        "importer": importer,
+        "start_weekday": first_day.isoweekday() % 7,
+        "counts": pack_counts(counts),
+        "imported_through": window.end,
+    }
+
+
+# Imports currently fetching each (user, year, importer), resolving to whether they
+# succeeded. Overlapping imports wait on these rather than querying GitHub again.
+_in_flight: dict[tuple[str, int, ContributionImporter], asyncio.Future[bool]] = {}
+
+
+async def import_years(
+    user: str, years: Sequence[int], token: Any | None, session: AsyncSession
+) -> list[int]:
+    """Import the given years' contributions, or the days since they were last imported.
+
+    Without a user's OAuth token, only the machine user's contributions are imported.
+
+    Years which another import is already fetching aren't fetched again; instead this
+    waits for that import, so every year has been imported once this returns.
+
+    Returns the years for which this import wrote anything.
+    """
+    queriers: dict[ContributionImporter, ContributionQuerier] = {
+        ContributionImporter.Bot: bot_contribution_querier,
+    }
+    if token is not None:
+        queriers[ContributionImporter.User] = oauth_contribution_querier(token)
+
+    claimed: dict[ContributionImporter, list[int]] = {}
+    waiting: set[asyncio.Future[bool]] = set()
+    for importer in queriers:
+        claimed[importer] = []
+        for year in years:
+            if (other := _in_flight.get((user, year, importer))) is not None:
+                waiting.add(other)
+                IMPORTS.labels(importer.value, "coalesced").inc()
+            else:
+                claimed[importer].append(year)
+
+    # Claim years before checking the database, so an import finishing in between has
+    # already written its rows by the time they're checked
+    finished = asyncio.get_running_loop().create_future()
+    keys = [(user, year, importer) for importer, ys in claimed.items() for year in ys]
+    for key in keys:
+        _in_flight[key] = finished
+
+    try:
+        imported_years = await _import_claimed_years(user, claimed, queriers, session)
+        finished.set_result(True)
+    except BaseException:
+        finished.set_result(False)
+        raise
+    finally:
+        for key in keys:
+            del _in_flight[key]
+
+    # Shielded, as the futures are shared with every other waiting import
+    if not all(await asyncio.gather(*(asyncio.shield(other) for other in waiting))):
+        raise RuntimeError("An overlapping import of the same years failed")
+
+    return imported_years
+
+
+async def _import_claimed_years(
+    user: str,
+    claimed: dict[ContributionImporter, list[int]],
+    queriers: dict[ContributionImporter, ContributionQuerier],
     session: AsyncSession,
-    querier: ContributionQuerier,
-) -> None:
-    logger.info("Importing contributions", user=user, year=year, importer=importer)
-
-    async with session.begin():
-        existing = (
-            await session.execute(
-                select(ContributionData).filter_by(
-                    user=user, year=year, importer=importer
+) -> list[int]:
+    """Import each importer's claimed years, skipping any already fully imported.
+
+    Each importer fetches all of its windows with a single GraphQL request, and the
+    results are written with a single upsert.
+    """
+    years = sorted(
+        {year for importer_years in claimed.values() for year in importer_years}
+    )
+    if not years:
+        return []
+
+    with stage("db_fetch"):
+        async with session.begin():
+            existing = await fetch_imported_rows(session, user, years)
+
+    today = datetime.now(timezone.utc).date()
+    windows: dict[ContributionImporter, dict[int, ImportWindow]] = {}
+    for importer, importer_years in claimed.items():
+        windows[importer] = {}
+        for year in importer_years:
+            row = existing.get((year, importer))
+            window = ImportWindow.for_row(year, row, today)
+            if window is None:
+                IMPORTS.labels(importer.value, "skipped").inc()
+                logger.info(
+                    "Contributions already imported",
+                    user=user,
+                    year=year,
+                    importer=importer,
                 )
-            )
-        ).scalar_one_or_none()
+                continue
 
-        if existing:
+            windows[importer][year] = window
+            IMPORTS.labels(
+                importer.value, "imported" if row is None else "refreshed"
+            ).inc()
             logger.info(
-                "Contributions already imported",
+                "Importing contributions",
                 user=user,
                 year=year,
                 importer=importer,
+                start=window.start,
+                end=window.end,
             )
-            return
 
-    data = await querier(user, year)
+    # Query every importer concurrently, then write everything together
+    fetched = await asyncio.gather(
+        *(
+            querier(user, list(windows[importer].values()))
+            for importer, querier in queriers.items()
+        )
+    )
+
+    rows = [
+        contribution_data_values(
+            user,
+            windows[importer][year],
+            importer,
+            collection,
+            existing.get((year, importer)),
+        )
+        for importer, collections in zip(queriers, fetched)
+        for year, collection in collections.items()
+    ]
+    if not rows:
+        return []
 
-    simplified_contributions: dict[date, int] = {}
-    total_contributions = 0
+    with stage("db_write"):
+        async with session.begin():
+            await upsert_contribution_data(session, rows)
 
-    for week in data.data.user.contributions_collection.contribution_calendar.weeks:
-        for day in week.contribution_days:
-            simplified_contributions[day.date] = day.contribution_count
-            total_contributions += day.contribution_count
+    imported_years = sorted({row["year"] for row in rows})
+    for year in imported_years:
+        await model_cache.invalidate(user, year)
 
-    async with session.begin():
-        contributions = ContributionData(
+    for row in rows:
+        logger.info(
+            "Imported contributions",
             user=user,
-            year=year,
-            contributions=Contributions.model_validate(
-                simplified_contributions
-            ).model_dump_json(),
-            importer=importer,
+            year=row["year"],
+            importer=row["importer"],
+            imported_through=row["imported_through"],
+            total_contributions=sum(unpack_counts(row["counts"])),
         )
-        session.add(contributions)
-
-    logger.info(
-        "Imported contributions",
-        user=user,
-        year=year,
-        importer=importer,
-        total_contributions=total_contributions,
-    )
 
-
-async def import_contributions(
-    user: str, year: int, token: Any, session: AsyncSession
-) -> None:
-    await import_year(
-        user,
-        year,
-        ContributionImporter.User,
-        session,
-        oauth_contribution_querier(token),
-    )
-    await import_year(
-        user,
-        year,
-        ContributionImporter.Bot,
-        session,
-        bot_contribution_querier,
-    )
+    return imported_years
 
 
-__all__ = ["import_contributions"]
+__all__ = ["ImportWindow", "import_years"]
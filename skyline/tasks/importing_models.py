@@ -24,18 +24,22 @@ class ContributionsQueryContributionCollection(BaseModel):
     )
 
 
-class ContributionsQueryUser(BaseModel):
-    contributions_collection: ContributionsQueryContributionCollection = Field(
-        alias="contributionsCollection"
-    )
+class ContributionsQueryRateLimit(BaseModel):
+    cost: int
+    remaining: int
+    reset_at: str = Field(alias="resetAt")
 
 
 class ContributionsQueryData(BaseModel):
-    user: ContributionsQueryUser
+    # Each year's contributions collection, keyed by its alias in the query
+    user: dict[str, ContributionsQueryContributionCollection]
+    rate_limit: ContributionsQueryRateLimit | None = Field(
+        default=None, alias="rateLimit"
+    )
 
 
 class ContributionsQueryResponse(BaseModel):
     data: ContributionsQueryData
 
 
-__all__ = ["ContributionsQueryResponse"]
+__all__ = ["ContributionsQueryContributionCollection", "ContributionsQueryResponse"]
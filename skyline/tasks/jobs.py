@@ -0,0 +1,130 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from skyline.config import config
+from skyline.db import async_session
+from skyline.metrics import observe_stages
+from skyline.schemas.contributions import ImportJobSchema, ImportJobStatus
+from skyline.timing import collect_stages
+
+from .importing import import_years
+from .pregeneration import model_pregenerator
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class ImportJob:
+    user: str
+    years: tuple[int, ...]
+    token: Any = field(repr=False)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: ImportJobStatus = ImportJobStatus.Queued
+    imported_years: list[int] = field(default_factory=list)
+    error: str | None = None
+    finished_at: float | None = None
+
+    @property
+    def key(self) -> tuple[str, tuple[int, ...]]:
+        return self.user, self.years
+
+    def to_schema(self) -> ImportJobSchema:
+        return ImportJobSchema(
+            id=self.id,
+            status=self.status,
+            years=list(self.years),
+            imported_years=self.imported_years,
+            error=self.error,
+        )
+
+
+class ImportJobQueue:
+    """In-process queue running contribution imports in the background.
+
+    At most `concurrency` imports run at once, across all users. Submitting an import
+    which is identical to one still queued or running returns the existing job.
+    """
+
+    def __init__(self, *, concurrency: int, retention_seconds: float) -> None:
+        self.concurrency = concurrency
+        self.retention_seconds = retention_seconds
+
+        self._queue: asyncio.Queue[ImportJob] = asyncio.Queue()
+        self._jobs: dict[str, ImportJob] = {}
+        self._pending: dict[tuple[str, tuple[int, ...]], ImportJob] = {}
+        self._workers: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, user: str, years: list[int], token: Any) -> ImportJob:
+        self._prune()
+
+        job = ImportJob(user=user, years=tuple(years), token=token)
+        if existing := self._pending.get(job.key):
+            return existing
+
+        self._jobs[job.id] = job
+        self._pending[job.key] = job
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str) -> ImportJob | None:
+        return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.retention_seconds
+        for job_id in [
+            job.id
+            for job in self._jobs.values()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]:
+            del self._jobs[job_id]
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = ImportJobStatus.Running
+
+            try:
+                with collect_stages() as timings:
+                    async with async_session() as session:
+                        job.imported_years = await import_years(
+                            job.user, job.years, job.token, session
+                        )
+                observe_stages("import", timings)
+                job.status = ImportJobStatus.Succeeded
+                model_pregenerator.schedule(job.user, job.imported_years)
+            except Exception:
+                logger.exception(
+                    "Import job failed", job_id=job.id, user=job.user, years=job.years
+                )
+                job.status = ImportJobStatus.Failed
+                job.error = "Failed to import contributions from GitHub."
+            finally:
+                # The token is only needed while the import runs
+                job.token = None
+                job.finished_at = time.monotonic()
+                del self._pending[job.key]
+                self._queue.task_done()
+
+
+import_job_queue = ImportJobQueue(
+    concurrency=config.import_concurrency,
+    retention_seconds=config.import_job_retention_seconds,
+)
+
+__all__ = ["ImportJob", "ImportJobQueue", "import_job_queue"]
@@ -0,0 +1,132 @@
+import asyncio
+from typing import Sequence
+
+import structlog
+
+from skyline.cad.cache import model_cache, model_cache_key
+from skyline.cad.generation import model_label
+from skyline.cad.pool import ModelGenerationOverloaded, model_pool
+from skyline.config import config
+from skyline.db import async_read_session
+from skyline.metrics import MODEL_PREGENERATIONS
+from skyline.queries import YearContributions, fetch_years_contributions
+from skyline.schemas.contributions import (
+    ModelContributionSelection,
+    ModelEngine,
+    ModelFormat,
+)
+
+logger = structlog.get_logger()
+
+
+class ModelPregenerator:
+    """Generates the commonly requested models for newly imported years ahead of time.
+
+    Models are generated with the default engine and format, for every contribution
+    selection with and without labels, and stored in the model cache. At most
+    `concurrency` are generated at once, and a model is skipped rather than queued
+    whenever every model generation worker is busy, so requests always come first.
+    """
+
+    def __init__(self, *, enabled: bool, concurrency: int) -> None:
+        self.enabled = enabled
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def schedule(self, user: str, years: Sequence[int]) -> None:
+        if not self.enabled or not years:
+            return
+
+        task = asyncio.create_task(self._pregenerate(user, years))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _pregenerate(self, user: str, years: Sequence[int]) -> None:
+        try:
+            async with async_read_session() as session, session.begin():
+                contributions = await fetch_years_contributions(session, user, years)
+
+            # The most recent year is the most likely to be requested first
+            for year, year_contributions in sorted(contributions.items(), reverse=True):
+                for selection in ModelContributionSelection:
+                    if (
+                        selection == ModelContributionSelection.Work
+                        and not year_contributions.work_available
+                    ):
+                        continue
+
+                    for include_labels in (False, True):
+                        await self._pregenerate_model(
+                            user, year_contributions, selection, include_labels
+                        )
+        except Exception:
+            logger.exception("Model pre-generation failed", user=user, years=years)
+
+    async def _pregenerate_model(
+        self,
+        user: str,
+        contributions: YearContributions,
+        contribution_selection: ModelContributionSelection,
+        include_labels: bool,
+    ) -> None:
+        async with self._semaphore:
+            year = contributions.year
+            days = contributions.padded_days(contribution_selection)
+            label = (
+                model_label(user, str(year), contribution_selection)
+                if include_labels
+                else None
+            )
+            cache_key = model_cache_key(
+                days=days,
+                label=label,
+                include_month_label=include_labels,
+                contribution_selection=contribution_selection.value,
+                engine=ModelEngine.CadQuery.value,
+                model_format=ModelFormat.STL.value,
+            )
+
+            if await model_cache.get(user, year, cache_key) is not None:
+                MODEL_PREGENERATIONS.labels("cached").inc()
+                return
+
+            if model_pool.in_flight >= model_pool.workers:
+                MODEL_PREGENERATIONS.labels("dropped").inc()
+                return
+
+            try:
+                model = await model_pool.generate(
+                    key=cache_key,
+                    engine=ModelEngine.CadQuery,
+                    days=days,
+                    label=label,
+                    include_month_label=include_labels,
+                    model_format=ModelFormat.STL,
+                )
+            except ModelGenerationOverloaded:
+                MODEL_PREGENERATIONS.labels("dropped").inc()
+                return
+
+            await model_cache.put(user, year, cache_key, model)
+            MODEL_PREGENERATIONS.labels("generated").inc()
+            logger.info(
+                "Pre-generated model",
+                user=user,
+                year=year,
+                contribution_selection=contribution_selection.value,
+                include_labels=include_labels,
+            )
+
+
+model_pregenerator = ModelPregenerator(
+    enabled=config.model_pregeneration_enabled,
+    concurrency=config.model_pregeneration_concurrency,
+)
+
+__all__ = ["ModelPregenerator", "model_pregenerator"]
@@ -0,0 +1,199 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable
+
+import httpx
+import structlog
+
+from skyline.config import config
+
+logger = structlog.get_logger()
+
+MACHINE_USER_KEY = "machine"
+
+
+def oauth_key(user: str) -> str:
+    return f"user:{user}"
+
+
+def _parse_retry_after(value: str, default: float) -> float:
+    """Parse a Retry-After header, given either as seconds or as an HTTP date."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+
+    # HTTP dates are always in GMT, but tolerate ones without a zone
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RateLimitExhausted(Exception):
+    """Raised when a token's budget will not reset soon enough to wait for it."""
+
+
+@dataclass
+class RateLimitBudget:
+    """The last known GraphQL rate limit state of a single token."""
+
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None
+    last_cost: int = 1
+    throttled_until: float | None = None
+
+    def available_at(self, reserve: int) -> float | None:
+        """When a request may next be sent, or None if it may be sent now."""
+        now = time.time()
+        if self.throttled_until is not None and self.throttled_until > now:
+            return self.throttled_until
+        if (
+            self.remaining is not None
+            and self.reset_at is not None
+            and self.reset_at > now
+            and self.remaining - self.last_cost < reserve
+        ):
+            return self.reset_at
+        return None
+
+
+class GitHubRateLimiter:
+    """Schedules requests to GitHub so each token stays within its rate limit.
+
+    Budgets are tracked per token from the `X-RateLimit-*` response headers and the
+    GraphQL `rateLimit` cost. Requests are delayed rather than sent once a token gets
+    within `reserve` points of exhausting its budget, and secondary rate limit
+    responses are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        *,
+        reserve: int,
+        max_wait_seconds: float,
+        max_retries: int,
+        backoff_base_seconds: float,
+        backoff_max_seconds: float,
+    ) -> None:
+        self.reserve = reserve
+        self.max_wait_seconds = max_wait_seconds
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+        self.budgets: dict[str, RateLimitBudget] = {}
+
+    async def _wait_for_budget(self, key: str, budget: RateLimitBudget) -> None:
+        while (available_at := budget.available_at(self.reserve)) is not None:
+            delay = available_at - time.time()
+            if delay > self.max_wait_seconds:
+                raise RateLimitExhausted(
+                    f"Rate limit for {key} resets in {delay:.0f} seconds"
+                )
+
+            logger.info("Delaying request for rate limit", key=key, delay=delay)
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * 2**attempt)
+        return delay * random.uniform(0.5, 1.5)
+
+    def record_cost(self, key: str, cost: int, remaining: int, reset_at: str) -> None:
+        """Record the `rateLimit` block of a GraphQL response."""
+        budget = self.budgets.setdefault(key, RateLimitBudget())
+        budget.last_cost = max(cost, 1)
+        budget.remaining = remaining
+        budget.reset_at = datetime.fromisoformat(reset_at).timestamp()
+
+    def _record_headers(
+        self, budget: RateLimitBudget, response: httpx.Response
+    ) -> None:
+        headers = response.headers
+        if "x-ratelimit-limit" in headers:
+            budget.limit = int(headers["x-ratelimit-limit"])
+        if "x-ratelimit-remaining" in headers:
+            budget.remaining = int(headers["x-ratelimit-remaining"])
+        if "x-ratelimit-reset" in headers:
+            budget.reset_at = float(headers["x-ratelimit-reset"])
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float | None:
+        """How long to wait before retrying a rate limited response, if it was."""
+        if response.status_code not in (
+            httpx.codes.FORBIDDEN,
+            httpx.codes.TOO_MANY_REQUESTS,
+        ):
+            return None
+
+        if "retry-after" in response.headers:
+            return _parse_retry_after(
+                response.headers["retry-after"], self._backoff(attempt)
+            )
+
+        if response.headers.get("x-ratelimit-remaining") == "0":
+            if (reset := response.headers.get("x-ratelimit-reset")) is None:
+                return self._backoff(attempt)
+            return float(reset) - time.time()
+
+        if "secondary rate limit" in response.text.lower():
+            return self._backoff(attempt)
+
+        return None
+
+    async def request(
+        self, key: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        budget = self.budgets.setdefault(key, RateLimitBudget())
+
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_budget(key, budget)
+
+            # Claim the expected cost up front, so concurrent requests for the same
+            # token don't all see the same remaining budget
+            if budget.remaining is not None:
+                budget.remaining -= budget.last_cost
+
+            response = await send()
+            self._record_headers(budget, response)
+
+            delay = self._retry_delay(response, attempt)
+            if delay is None or attempt == self.max_retries:
+                return response
+
+            logger.warning(
+                "Rate limited by GitHub",
+                key=key,
+                status_code=response.status_code,
+                attempt=attempt,
+                delay=delay,
+            )
+            budget.throttled_until = time.time() + delay
+
+        raise AssertionError("unreachable")
+
+
+github_rate_limiter = GitHubRateLimiter(
+    reserve=config.github_rate_limit_reserve,
+    max_wait_seconds=config.github_rate_limit_max_wait_seconds,
+    max_retries=config.github_max_retries,
+    backoff_base_seconds=config.github_backoff_base_seconds,
+    backoff_max_seconds=config.github_backoff_max_seconds,
+)
+
+__all__ = [
+    "MACHINE_USER_KEY",
+    "GitHubRateLimiter",
+    "RateLimitBudget",
+    "RateLimitExhausted",
+    "github_rate_limiter",
+    "oauth_key",
+]
@@ -0,0 +1,100 @@
+import asyncio
+import uuid
+from datetime import timedelta
+
+import structlog
+
+from skyline.config import config
+from skyline.db import async_read_session, async_session
+from skyline.metrics import observe_stages
+from skyline.models.contribution_data import ContributionImporter
+from skyline.queries import acquire_lease, fetch_incomplete_years, release_lease
+from skyline.timing import collect_stages
+
+from .importing import import_years
+from .pregeneration import model_pregenerator
+
+logger = structlog.get_logger()
+
+LEASE_NAME = "contribution_refresh"
+
+
+class ContributionRefresher:
+    """Periodically fetches the days since each incomplete year was last imported.
+
+    Only the machine user's contributions are refreshed. A user's own contributions
+    need their OAuth token, which isn't kept after their import, so those are refreshed
+    only when the user imports the year again. Until then the year stays incomplete, as
+    it's only imported through the earlier of the two importers' last days: "All"
+    contributions keep up to date, while personal and work contributions stop at the
+    user's last import.
+
+    When several instances share a database, only the one holding the refresh lease
+    refreshes. The lease outlasts two intervals, so another instance takes over if the
+    holder stops renewing it.
+    """
+
+    def __init__(self, *, enabled: bool, interval_seconds: float) -> None:
+        self.enabled = enabled
+        self.interval_seconds = interval_seconds
+
+        self._holder = uuid.uuid4().hex
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self.enabled:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+            try:
+                async with async_session() as session, session.begin():
+                    await release_lease(session, LEASE_NAME, self._holder)
+            except Exception:
+                logger.exception("Failed to release the contribution refresh lease")
+
+    async def _acquire_lease(self) -> bool:
+        try:
+            async with async_session() as session, session.begin():
+                return await acquire_lease(
+                    session,
+                    LEASE_NAME,
+                    self._holder,
+                    timedelta(seconds=2 * self.interval_seconds),
+                )
+        except Exception:
+            logger.exception("Failed to acquire the contribution refresh lease")
+            return False
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            if await self._acquire_lease():
+                await self.refresh()
+
+    async def refresh(self) -> None:
+        """Refresh every user's incomplete years, one user at a time."""
+        async with async_read_session() as session, session.begin():
+            incomplete = await fetch_incomplete_years(session, ContributionImporter.Bot)
+
+        for user, years in incomplete.items():
+            try:
+                with collect_stages() as timings:
+                    async with async_session() as session:
+                        refreshed_years = await import_years(user, years, None, session)
+                observe_stages("refresh", timings)
+                model_pregenerator.schedule(user, refreshed_years)
+            except Exception:
+                logger.exception("Contribution refresh failed", user=user, years=years)
+
+
+contribution_refresher = ContributionRefresher(
+    enabled=config.import_refresh_enabled,
+    interval_seconds=config.import_refresh_interval_seconds,
+)
+
+__all__ = ["ContributionRefresher", "contribution_refresher"]
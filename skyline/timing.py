@@ -0,0 +1,68 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Mapping
+
+import structlog
+
+
+class StageTimings:
+    """How long each stage of an operation took, in seconds."""
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+        structlog.contextvars.bind_contextvars(
+            stage_timings_ms={
+                name: round(duration * 1000, 1)
+                for name, duration in self.durations.items()
+            }
+        )
+
+    def update(self, durations: Mapping[str, float]) -> None:
+        for stage, seconds in durations.items():
+            self.add(stage, seconds)
+
+    def server_timing(self) -> str:
+        """Format the timings as a `Server-Timing` header value."""
+        return ", ".join(
+            f"{name};dur={duration * 1000:.1f}"
+            for name, duration in self.durations.items()
+        )
+
+
+_current_timings: ContextVar[StageTimings | None] = ContextVar(
+    "stage_timings", default=None
+)
+
+
+def current_timings() -> StageTimings | None:
+    return _current_timings.get()
+
+
+@contextmanager
+def collect_stages() -> Iterator[StageTimings]:
+    """Collect the timings of every `stage` run within this context."""
+    timings = StageTimings()
+    token = _current_timings.set(timings)
+    try:
+        with structlog.contextvars.bound_contextvars(stage_timings_ms={}):
+            yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a stage of the current operation. Does nothing outside `collect_stages`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if (timings := _current_timings.get()) is not None:
+            timings.add(name, time.perf_counter() - start)
+
+
+__all__ = ["StageTimings", "collect_stages", "current_timings", "stage"]
@@ -0,0 +1,18 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Configure Skyline before it's imported, so the tests never touch a real database or
+# model cache
+_work_dir = Path(tempfile.mkdtemp(prefix="skyline-tests-"))
+os.environ["SKYLINE_DB_PATH"] = str(_work_dir / "skyline.sqlite")
+os.environ["SKYLINE_DB_URL"] = f"sqlite+aiosqlite:///{_work_dir / 'skyline.sqlite'}"
+os.environ["SKYLINE_MODEL_CACHE_DIR"] = str(_work_dir / "model_cache")
+(_work_dir / "frontend").mkdir()
+os.environ["SKYLINE_FRONTEND_DIR"] = str(_work_dir / "frontend")
+for setting in (
+    "SKYLINE_GITHUB_CLIENT_ID",
+    "SKYLINE_GITHUB_CLIENT_SECRET",
+    "SKYLINE_GITHUB_MACHINE_USER_PAT",
+):
+    os.environ.setdefault(setting, "test")
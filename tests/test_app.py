@@ -0,0 +1,8 @@
+from fastapi.routing import APIRoute
+
+
+def test_app_imports() -> None:
+    from skyline.app import app
+
+    paths = {route.path for route in app.routes if isinstance(route, APIRoute)}
+    assert "/contributions/model/{year}" in paths
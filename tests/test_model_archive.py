@@ -0,0 +1,118 @@
+import asyncio
+from datetime import date
+from typing import Any
+
+import pytest
+
+from skyline.cad.cache import model_cache
+from skyline.cad.pool import ModelGenerationOverloaded, model_pool
+from skyline.config import config
+from skyline.models.contribution_data import (
+    ContributionData,
+    ContributionImporter,
+    pack_counts,
+)
+from skyline.queries import YearContributions
+from skyline.routers.contributions import (
+    ARCHIVE_GENERATION_ATTEMPTS,
+    ARCHIVE_OVERLOADED_ERROR,
+    _archive_models,
+)
+from skyline.schemas.contributions import (
+    ModelArchiveSpecSchema,
+    ModelContributionSelection,
+    ModelEngine,
+    ModelFormat,
+)
+
+YEARS = range(2013, 2023)
+
+
+def _contributions(year: int) -> YearContributions:
+    rows = {
+        importer: ContributionData(
+            user="octo",
+            year=year,
+            importer=importer,
+            start_weekday=date(year, 1, 1).isoweekday() % 7,
+            counts=pack_counts([1] * (date(year, 12, 31).timetuple().tm_yday)),
+            imported_through=date(year, 12, 31),
+        )
+        for importer in ContributionImporter
+    }
+    return YearContributions.from_rows(
+        rows[ContributionImporter.User], rows[ContributionImporter.Bot]
+    )
+
+
+def _archive(specs: list[ModelArchiveSpecSchema]):
+    return _archive_models(
+        "octo",
+        specs,
+        {year: _contributions(year) for year in YEARS},
+        ModelEngine.Mesh,
+        ModelFormat.STL,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _uncached_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(model_cache, "memory_budget", 0)
+    monkeypatch.setattr(model_cache, "directory", None)
+    monkeypatch.setattr(model_pool, "workers", 4)
+    monkeypatch.setattr(config, "model_retry_after_seconds", 0)
+
+
+def test_overloaded_models_are_replaced_by_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    attempts: list[str] = []
+
+    async def overloaded(*, key: str, **_: Any) -> bytes:
+        attempts.append(key)
+        raise ModelGenerationOverloaded()
+
+    monkeypatch.setattr(model_pool, "generate", overloaded)
+
+    async def collect() -> list[tuple[str, bytes]]:
+        specs = [
+            ModelArchiveSpecSchema(year=2022),
+            ModelArchiveSpecSchema(
+                year=2021, contributions=ModelContributionSelection.Work
+            ),
+        ]
+        return [entry async for entry in _archive(specs)]
+
+    entries = sorted(asyncio.run(collect()))
+
+    assert entries == [
+        ("octo-2021-work.stl.error.txt", ARCHIVE_OVERLOADED_ERROR),
+        ("octo-2022-all.stl.error.txt", ARCHIVE_OVERLOADED_ERROR),
+    ]
+    assert len(attempts) == 2 * ARCHIVE_GENERATION_ATTEMPTS
+
+
+def test_models_are_only_built_a_few_ahead(monkeypatch: pytest.MonkeyPatch) -> None:
+    generated: list[str] = []
+
+    async def generate(*, key: str, **_: Any) -> bytes:
+        generated.append(key)
+        return key.encode()
+
+    monkeypatch.setattr(model_pool, "generate", generate)
+
+    async def consume_slowly() -> list[int]:
+        ahead = []
+        written = 0
+        async for _ in _archive([ModelArchiveSpecSchema(year=year) for year in YEARS]):
+            written += 1
+            # Let every started build finish before writing the next model
+            await asyncio.sleep(0.01)
+            ahead.append(len(generated) - written)
+        return ahead
+
+    ahead = asyncio.run(consume_slowly())
+
+    assert len(generated) == len(YEARS)
+    # Two models are generated at once with four workers, so four are built ahead
+    assert max(ahead) <= 4
@@ -0,0 +1,47 @@
+import calendar
+import random
+from datetime import date
+
+import pytest
+
+from skyline.cad.mesh import Mesh
+from skyline.cad.skyline import skyline_model
+from skyline.cad.skyline_mesh import skyline_mesh
+
+
+def _days(year: int, counts: list[int]) -> list[int | None]:
+    # Padded to start on a Sunday, as passed to model generation
+    return [None] * (date(year, 1, 1).isoweekday() % 7) + counts
+
+
+def _random_counts(year: int, seed: int, length: int | None = None) -> list[int]:
+    rng = random.Random(seed)
+    if length is None:
+        length = 366 if calendar.isleap(year) else 365
+    return [rng.choice((0, 0, 1, 1, 2, 3, 5, 8)) for _ in range(length)]
+
+
+FIXTURES = {
+    "leap": _days(2024, _random_counts(2024, 1)),
+    "starts-sunday": _days(2023, _random_counts(2023, 2)),
+    "all-zero": _days(2021, [0] * 365),
+    # Only the days up to October 18th have happened yet
+    "partial": _days(2026, _random_counts(2026, 3, length=291)),
+}
+
+
+def _assert_equivalent(actual: Mesh, expected: Mesh) -> None:
+    assert actual.volume() == pytest.approx(expected.volume(), rel=1e-9)
+    for actual_corner, expected_corner in zip(actual.bounds(), expected.bounds()):
+        assert actual_corner == pytest.approx(expected_corner, abs=1e-9)
+
+
+@pytest.mark.parametrize("merge_columns", [False, True], ids=["separate", "merged"])
+@pytest.mark.parametrize("days", FIXTURES.values(), ids=FIXTURES.keys())
+def test_skyline_mesh_matches_cadquery(
+    days: list[int | None], merge_columns: bool
+) -> None:
+    expected = skyline_model(
+        days=days, label=None, include_month_label=False, merge_columns=merge_columns
+    )
+    _assert_equivalent(skyline_mesh(days=days), expected)